@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from airflow.sdk import dag, task
+from datetime import datetime
+
+# every 15 minutes during US market hours (UTC)
+@dag(schedule="*/15 13-21 * * 1-5", start_date=datetime(2026, 10, 19), catchup=False)
+def intraday_ingestion():
+
+    @task
+    def minute_bars():
+        from ingestion.intraday_fetcher import run
+        run("1m")
+
+    @task
+    def hour_bars():
+        from ingestion.intraday_fetcher import run
+        run("1h")
+
+    minute_bars()
+    hour_bars()
+
+intraday_ingestion()
@@ -43,6 +43,20 @@ DB_URL:      str            = _get_req_env("DB_URL")
 LOG_LEVEL:   str            = os.getenv("LOG_LEVEL", "INFO").upper()
 MLFLOW_URI:  str            = os.getenv("MLFLOW_URI", "http://localhost:5000")
 
+# ── Models ────────────────────────────────────────────────────────────────────
+# pytorch (full precision) | quantized (dynamic int8) | onnx (ONNX Runtime, needs optimum)
+FINBERT_BACKEND: str        = os.getenv("FINBERT_BACKEND", "pytorch").lower()
+# loopback host:port or unix socket path ("unix:/path") of a running
+# ingestion/sentiment_server.py; empty = load FinBERT in-process
+SENTIMENT_SERVER: str       = os.getenv("SENTIMENT_SERVER", "")
+# shared secret for the server handshake; required, no default
+SENTIMENT_SERVER_AUTHKEY: str = os.getenv("SENTIMENT_SERVER_AUTHKEY", "")
+
+# ── Feature store cache ───────────────────────────────────────────────────────
+# in-process cache of per-ticker feature frames (ml/feature_store.py)
+FEATURE_CACHE_MAX_MB: float = float(os.getenv("FEATURE_CACHE_MAX_MB", "256"))
+FEATURE_CACHE_TTL:    float = float(os.getenv("FEATURE_CACHE_TTL", "3600"))   # seconds
+
 # ── Optional API keys ─────────────────────────────────────────────────────────
 API_KEYS:          Dict[str, str] = _parse_api_key(os.getenv("API_KEYS", ""))
 FRED_API_KEY:      str            = _get_req_env("FRED_API_KEY")
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from itertools import islice
+from typing import Callable, Iterable
+
+import pandas as pd
+from sqlalchemy.orm import Session
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 5000
+
+
+def _chunks(rows, chunk_size: int):
+    if isinstance(rows, pd.DataFrame):
+        for start in range(0, len(rows), chunk_size):
+            yield rows.iloc[start:start + chunk_size]
+        return
+
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _single_rows(chunk):
+    if isinstance(chunk, pd.DataFrame):
+        return (chunk.iloc[i:i + 1] for i in range(len(chunk)))
+    return ([row] for row in chunk)
+
+
+def iter_records(df: pd.DataFrame, slice_rows: int = CHUNK_SIZE):
+    """Yield a DataFrame's rows as native-typed dicts, converting one slice at a time."""
+    for start in range(0, len(df), slice_rows):
+        yield from df.iloc[start:start + slice_rows].to_dict(orient="records")
+
+
+def _write(session: Session, write_fn: Callable, chunk) -> int:
+    written = write_fn(session, chunk)
+    return len(chunk) if written is None or written < 0 else written
+
+
+def write_batches(
+    session: Session,
+    write_fn: Callable,
+    rows: Iterable[dict] | pd.DataFrame,
+    chunk_size: int = CHUNK_SIZE,
+    label: str = "",
+) -> dict:
+    """
+    Feed `rows` (a generator, list or DataFrame) to `write_fn(session, chunk)`
+    `chunk_size` rows at a time, so at most one chunk is held in memory.
+
+    `write_fn` is one of the crud.insert_* / bulk_loader.copy_* functions and
+    returns the rows it actually wrote. If a chunk fails it is rolled back and
+    retried row by row, so one bad row only costs itself. Rows not written
+    (ON CONFLICT skips and failed rows) are reported as skipped.
+    """
+    stats = {"written": 0, "skipped": 0, "failed": 0, "chunks": []}
+    prefix = f"[{label}] " if label else ""
+
+    for n, chunk in enumerate(_chunks(rows, chunk_size), start=1):
+        failed = 0
+        try:
+            written = _write(session, write_fn, chunk)
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"{prefix}chunk {n} failed ({e}); retrying row by row")
+            written = 0
+            for row in _single_rows(chunk):
+                try:
+                    written += _write(session, write_fn, row)
+                except Exception as row_error:
+                    session.rollback()
+                    failed += 1
+                    logger.warning(f"{prefix}dropped row: {row_error}")
+
+        chunk_stats = {
+            "rows":    len(chunk),
+            "written": written,
+            "skipped": len(chunk) - written,
+            "failed":  failed,
+        }
+        stats["chunks"].append(chunk_stats)
+        stats["written"] += written
+        stats["skipped"] += chunk_stats["skipped"]
+        stats["failed"]  += failed
+        logger.debug(
+            f"{prefix}chunk {n}: {written}/{len(chunk)} written, "
+            f"{chunk_stats['skipped']} skipped ({failed} failed)"
+        )
+
+    logger.info(
+        f"{prefix}{stats['written']} written, {stats['skipped']} skipped "
+        f"({stats['failed']} failed) in {len(stats['chunks'])} chunks"
+    )
+    return stats
@@ -1,7 +1,7 @@
 from datetime import date
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import text
+from sqlalchemy import text, func
 
 import sys
 from pathlib import Path
@@ -9,15 +9,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from database.models import (
     MarketData, CryptoPrice, EconomicIndicator,
-    NewsSentiment, Anomaly, Forecast, PortfolioWeight, ModelRun, Features
+    NewsSentiment, Anomaly, Forecast, PortfolioWeight, ModelRun, Features,
+    IntradayBar, QuarantinedRow
 )
 
 
-def insert_market_data(session: Session, rows: list[dict]) -> None:
+def insert_market_data(session: Session, rows: list[dict]) -> int:
+    if not rows:
+        return 0
     stmt = insert(MarketData).values(rows)
     stmt = stmt.on_conflict_do_nothing(index_elements=["ticker", "date"])
-    session.execute(stmt)
+    result = session.execute(stmt)
     session.commit()
+    return result.rowcount
 
 
 def get_latest_prices(session: Session, ticker: str, limit: int = 100) -> list[MarketData]:
@@ -29,15 +33,63 @@ def get_latest_prices(session: Session, ticker: str, limit: int = 100) -> list[M
         .all()
     )
 
+def get_prices_after(session: Session, ticker: str, after, lookback: int) -> list[MarketData]:
+    """Rows dated after `after` plus the `lookback` rows up to and including it, oldest first."""
+    warmup = (
+        session.query(MarketData)
+        .filter(MarketData.ticker == ticker, MarketData.date <= after)
+        .order_by(MarketData.date.desc())
+        .limit(lookback)
+        .all()
+    )
+    new = (
+        session.query(MarketData)
+        .filter(MarketData.ticker == ticker, MarketData.date > after)
+        .order_by(MarketData.date)
+        .all()
+    )
+    return warmup[::-1] + new
+
+def get_latest_dates(session: Session, model, key: str) -> dict:
+    """Return {key value: max(date)} for a (key, date) table, e.g. the ingestion watermark."""
+    key_col = getattr(model, key)
+    rows = (
+        session.query(key_col, func.max(model.date))
+        .group_by(key_col)
+        .all()
+    )
+    return {row[0]: row[1] for row in rows}
+
+def get_recent_closes(session: Session, model, key: str, keys: list[str], n: int = 5) -> dict:
+    """Return {key value: [close, ...]} with each key's last `n` stored closes, oldest first."""
+    rows = session.execute(text(f"""
+        SELECT {key}, close
+        FROM (
+            SELECT {key}, date, close,
+                   ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY date DESC) AS rn
+            FROM {model.__tablename__}
+            WHERE {key} = ANY(:keys) AND close IS NOT NULL
+        ) recent
+        WHERE rn <= :n
+        ORDER BY {key}, date ASC
+    """), {"keys": list(keys), "n": n}).all()
+    closes = {}
+    for k, close in rows:
+        closes.setdefault(k, []).append(float(close))
+    return closes
+
 def get_all_tickers(session: Session) -> list[str]:
     rows = session.query(MarketData.ticker).distinct().all()
     return [row[0] for row in rows]
 
-def insert_crypto_prices(session: Session, rows: list[dict]) -> None:
+def insert_crypto_prices(session: Session, rows: list[dict]) -> int:
+    if not rows:
+        return 0
     stmt = insert(CryptoPrice).values(rows)
     stmt = stmt.on_conflict_do_nothing(index_elements=["symbol", "date"])
-    session.execute(stmt)
+    result = session.execute(stmt)
     session.commit()
+    return result.rowcount
 
 
 def get_latest_crypto(session: Session, symbol: str, limit: int = 100) -> list[CryptoPrice]:
@@ -50,11 +102,14 @@ def get_latest_crypto(session: Session, symbol: str, limit: int = 100) -> list[C
     )
 
 
-def insert_economic_indicators(session: Session, rows: list[dict]) -> None:
+def insert_economic_indicators(session: Session, rows: list[dict]) -> int:
+    if not rows:
+        return 0
     stmt = insert(EconomicIndicator).values(rows)
     stmt = stmt.on_conflict_do_nothing(index_elements=["series_id", "date"])
-    session.execute(stmt)
+    result = session.execute(stmt)
     session.commit()
+    return result.rowcount
 
 
 def get_indicator(session: Session, series_id: str, limit: int = 100) -> list[EconomicIndicator]:
@@ -67,9 +122,14 @@ def get_indicator(session: Session, series_id: str, limit: int = 100) -> list[Ec
     )
 
 
-def insert_sentiment(session: Session, rows: list[dict]) -> None:
-    session.bulk_insert_mappings(NewsSentiment, rows)
+def insert_sentiment(session: Session, rows: list[dict]) -> int:
+    if not rows:
+        return 0
+    stmt = insert(NewsSentiment).values(rows)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["ticker", "headline", "published_at"])
+    result = session.execute(stmt)
     session.commit()
+    return result.rowcount
 
 
 def get_sentiment(session: Session, ticker: str, limit: int = 50) -> list[NewsSentiment]:
@@ -184,11 +244,14 @@ def get_model_runs(session: Session, model_name: str) -> list[ModelRun]:
         .all()
     )
 
-def insert_features(session: Session, rows: list[dict]) -> None:
+def insert_features(session: Session, rows: list[dict]) -> int:
+    if not rows:
+        return 0
     stmt = insert(Features).values(rows)
     stmt = stmt.on_conflict_do_nothing(index_elements=["ticker", "date"])
-    session.execute(stmt)
+    result = session.execute(stmt)
     session.commit()
+    return result.rowcount
 
 
 def get_features(session: Session, ticker: str, limit: int = 100) -> list[Features]:
@@ -201,6 +264,110 @@ def get_features(session: Session, ticker: str, limit: int = 100) -> list[Featur
     )
 
 
+def insert_quarantine(session: Session, rows: list[dict]) -> int:
+    # rejected rows stay behind the watermark, so later runs reject them again
+    if not rows:
+        return 0
+    stmt = insert(QuarantinedRow).values(rows)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["source", "key", "date", "reason"])
+    result = session.execute(stmt)
+    session.commit()
+    return result.rowcount
+
+
+def get_quarantine(session: Session, source: str | None = None, limit: int = 100) -> list[QuarantinedRow]:
+    query = session.query(QuarantinedRow)
+    if source:
+        query = query.filter(QuarantinedRow.source == source)
+    return query.order_by(QuarantinedRow.created_at.desc()).limit(limit).all()
+
+
+INTRADAY_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+
+def get_intraday_watermarks(session: Session, interval: str) -> dict:
+    rows = (
+        session.query(IntradayBar.ticker, func.max(IntradayBar.ts))
+        .filter(IntradayBar.interval == interval)
+        .group_by(IntradayBar.ticker)
+        .all()
+    )
+    return {row[0]: row[1] for row in rows}
+
+
+def get_intraday_bars(session: Session, ticker: str, interval: str, start, end=None,
+                      columns: list[str] | None = None):
+    """
+    Bars for one ticker in [start, end) as a DataFrame. The predicate is a
+    plain range on the primary key (ticker, interval, ts), so Postgres only
+    touches the matching chunks / index range no matter how large the table is.
+    """
+    import pandas as pd
+
+    columns = columns or INTRADAY_COLUMNS
+    unknown = set(columns) - {c.name for c in IntradayBar.__table__.columns}
+    if unknown:
+        raise ValueError(f"Unknown intraday columns: {sorted(unknown)}")
+
+    query = f"""
+        SELECT {", ".join(columns)}
+        FROM market_bars_intraday
+        WHERE ticker = :ticker
+          AND interval = :interval
+          AND ts >= :start
+          {"AND ts < :end" if end is not None else ""}
+        ORDER BY ts ASC
+    """
+    params = {"ticker": ticker, "interval": interval, "start": start}
+    if end is not None:
+        params["end"] = end
+    return pd.read_sql(text(query), session.connection(), params=params)
+
+
+PANEL_COLUMNS = ["ticker", "date", "open", "high", "low", "close", "volume"]
+
+
+def get_price_panel(session: Session, tickers: list[str] | None = None, full_rows: int = 500,
+                    lookback: int = 250, incremental: bool = True):
+    """
+    Prices for many tickers in one query, as a long DataFrame sorted by
+    (ticker, date) with a `last_feature` column. Incremental: rows after
+    each ticker's last feature date plus `lookback` warm-up rows before it;
+    tickers without features (or incremental=False) get their latest
+    `full_rows` rows; tickers with no new prices are left out.
+    """
+    import pandas as pd
+
+    query = f"""
+        WITH last AS (
+            SELECT ticker, MAX(date) AS last_feature
+            FROM features
+            {"" if incremental else "WHERE FALSE"}
+            GROUP BY ticker
+        ),
+        ranked AS (
+            SELECT m.ticker, m.date, m.open, m.high, m.low, m.close, m.volume, l.last_feature,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY m.ticker, m.date > l.last_feature ORDER BY m.date DESC
+                   ) AS rn
+            FROM market_data m
+            LEFT JOIN last l ON l.ticker = m.ticker
+            {"WHERE m.ticker = ANY(:tickers)" if tickers else ""}
+        )
+        SELECT {", ".join(PANEL_COLUMNS)}, last_feature
+        FROM ranked
+        WHERE (date > last_feature
+               OR rn <= CASE WHEN last_feature IS NULL THEN :full_rows ELSE :lookback END)
+          AND (last_feature IS NULL
+               OR ticker IN (SELECT ticker FROM ranked WHERE date > last_feature))
+        ORDER BY ticker, date
+    """
+    params = {"full_rows": full_rows, "lookback": lookback}
+    if tickers:
+        params["tickers"] = list(tickers)
+    return pd.read_sql(text(query), session.connection(), params=params)
+
+
 if __name__ == "__main__":
     from database.connection import get_session
 
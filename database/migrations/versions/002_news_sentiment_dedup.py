@@ -0,0 +1,40 @@
+"""unique news_sentiment rows per (ticker, headline, published_at)
+
+Revision ID: 5b2d7e9c41a0
+Revises: 818e8287f63d
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2d7e9c41a0'
+down_revision: Union[str, None] = '818e8287f63d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep the earliest copy of every duplicated headline before adding the constraint
+    op.execute("""
+        DELETE FROM news_sentiment a
+        USING news_sentiment b
+        WHERE a.ticker = b.ticker
+          AND a.headline = b.headline
+          AND a.published_at = b.published_at
+          AND a.id > b.id
+    """)
+    op.create_index(
+        'uq_news_sentiment_ticker_headline_published',
+        'news_sentiment',
+        ['ticker', 'headline', 'published_at'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_news_sentiment_ticker_headline_published', table_name='news_sentiment')
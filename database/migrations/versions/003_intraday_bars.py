@@ -0,0 +1,60 @@
+"""intraday bar table
+
+Revision ID: 9e41c7a2b8d3
+Revises: 5b2d7e9c41a0
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e41c7a2b8d3'
+down_revision: Union[str, None] = '5b2d7e9c41a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'market_bars_intraday',
+        sa.Column('ticker', sa.Text(), nullable=False),
+        sa.Column('interval', sa.Text(), nullable=False),
+        sa.Column('ts', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('open', sa.REAL()),
+        sa.Column('high', sa.REAL()),
+        sa.Column('low', sa.REAL()),
+        sa.Column('close', sa.REAL(), nullable=False),
+        sa.Column('volume', sa.BigInteger()),
+        sa.PrimaryKeyConstraint('ticker', 'interval', 'ts'),
+    )
+    # TimescaleDB: one-day chunks + compression of week-old chunks.
+    # Plain Postgres: a BRIN index keeps time-range scans cheap at a few KB per GB.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+                PERFORM create_hypertable('market_bars_intraday', 'ts',
+                                          chunk_time_interval => INTERVAL '1 day',
+                                          if_not_exists => TRUE);
+                ALTER TABLE market_bars_intraday SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = 'ticker, interval',
+                    timescaledb.compress_orderby = 'ts DESC'
+                );
+                PERFORM add_compression_policy('market_bars_intraday', INTERVAL '7 days',
+                                               if_not_exists => TRUE);
+            ELSE
+                CREATE INDEX IF NOT EXISTS brin_market_bars_intraday_ts
+                    ON market_bars_intraday USING BRIN (ts) WITH (pages_per_range = 32);
+            END IF;
+        END
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('market_bars_intraday')
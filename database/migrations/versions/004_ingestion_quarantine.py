@@ -0,0 +1,39 @@
+"""ingestion quarantine table
+
+Revision ID: c7f05d13e6b9
+Revises: 9e41c7a2b8d3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f05d13e6b9'
+down_revision: Union[str, None] = '9e41c7a2b8d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_quarantine',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('source', sa.Text(), nullable=False),
+        sa.Column('key', sa.Text()),
+        sa.Column('date', sa.TIMESTAMP(timezone=True)),
+        sa.Column('reason', sa.Text(), nullable=False),
+        sa.Column('payload', postgresql.JSONB()),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('NOW()')),
+    )
+    op.create_index('idx_ingestion_quarantine_source_created', 'ingestion_quarantine',
+                    ['source', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ingestion_quarantine_source_created', table_name='ingestion_quarantine')
+    op.drop_table('ingestion_quarantine')
@@ -0,0 +1,46 @@
+"""feature_values EAV table for optional feature packs
+
+Revision ID: 3fa8d61e2c47
+Revises: c7f05d13e6b9
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3fa8d61e2c47'
+down_revision: Union[str, None] = 'c7f05d13e6b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per (ticker, date, feature): new pack features need no schema change.
+    op.create_table(
+        'feature_values',
+        sa.Column('ticker', sa.Text(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('feature', sa.Text(), nullable=False),
+        sa.Column('value', sa.Float()),
+        sa.PrimaryKeyConstraint('ticker', 'date', 'feature'),
+    )
+    op.create_index('idx_feature_values_feature_date', 'feature_values',
+                    ['feature', sa.text('date DESC')], unique=False)
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+                PERFORM create_hypertable('feature_values', 'date', if_not_exists => TRUE);
+            END IF;
+        END
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_feature_values_feature_date', table_name='feature_values')
+    op.drop_table('feature_values')
@@ -0,0 +1,54 @@
+"""store intraday volume as double precision
+
+Revision ID: 8b1e94d0c3f5
+Revises: 3fa8d61e2c47
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e94d0c3f5'
+down_revision: Union[str, None] = '3fa8d61e2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _alter_volume(type_: str) -> None:
+    # Crypto bars trade fractional units (0.4 BTC); BIGINT rounded them to 0.
+    # TimescaleDB cannot change a column type while compression is enabled,
+    # so compression is switched off around the ALTER and restored after.
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+                PERFORM remove_compression_policy('market_bars_intraday', if_exists => TRUE);
+                PERFORM decompress_chunk(c, if_compressed => TRUE)
+                    FROM show_chunks('market_bars_intraday') c;
+                ALTER TABLE market_bars_intraday SET (timescaledb.compress = false);
+                ALTER TABLE market_bars_intraday ALTER COLUMN volume TYPE {type_};
+                ALTER TABLE market_bars_intraday SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = 'ticker, interval',
+                    timescaledb.compress_orderby = 'ts DESC'
+                );
+                PERFORM add_compression_policy('market_bars_intraday', INTERVAL '7 days',
+                                               if_not_exists => TRUE);
+            ELSE
+                ALTER TABLE market_bars_intraday ALTER COLUMN volume TYPE {type_};
+            END IF;
+        END
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    _alter_volume('DOUBLE PRECISION')
+
+
+def downgrade() -> None:
+    _alter_volume('BIGINT USING round(volume)::bigint')
@@ -0,0 +1,42 @@
+"""unique ingestion_quarantine rows per (source, key, date, reason)
+
+Revision ID: 2d6a0f7b93e1
+Revises: 8b1e94d0c3f5
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6a0f7b93e1'
+down_revision: Union[str, None] = '8b1e94d0c3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a rejected row stays behind the watermark and was re-quarantined on every
+    # run; keep the earliest copy of each before adding the constraint
+    op.execute("""
+        DELETE FROM ingestion_quarantine a
+        USING ingestion_quarantine b
+        WHERE a.source = b.source
+          AND a.key IS NOT DISTINCT FROM b.key
+          AND a.date IS NOT DISTINCT FROM b.date
+          AND a.reason = b.reason
+          AND a.id > b.id
+    """)
+    op.create_index(
+        'uq_ingestion_quarantine_source_key_date_reason',
+        'ingestion_quarantine',
+        ['source', 'key', 'date', 'reason'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_ingestion_quarantine_source_key_date_reason', table_name='ingestion_quarantine')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, Text, Numeric, BigInteger, Integer, text
+from sqlalchemy import Column, Date, Text, Numeric, BigInteger, Integer, REAL, Float, text
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import TIMESTAMP
@@ -121,4 +121,42 @@ class Features(Base):
     rolling_skew_21 = Column(Numeric)
     rsi_14 = Column(Numeric)
     bb_pct_b = Column(Numeric)
-    volume_ratio = Column(Numeric)
\ No newline at end of file
+    volume_ratio = Column(Numeric)
+
+
+class FeatureValue(Base):
+    # Long (EAV) companion to Features for optional feature packs, so a new
+    # pack feature is a registry entry rather than a migration.
+    __tablename__ = "feature_values"
+
+    ticker = Column(Text, primary_key=True, nullable=False)
+    date = Column(Date, primary_key=True, nullable=False)
+    feature = Column(Text, primary_key=True, nullable=False)
+    value = Column(Float)
+
+
+class IntradayBar(Base):
+    # Minute/hour bars: hundreds of millions of rows, so 4-byte REAL prices
+    # instead of NUMERIC and a time-partitioned (hypertable / BRIN) layout.
+    __tablename__ = "market_bars_intraday"
+
+    ticker = Column(Text, primary_key=True, nullable=False)
+    interval = Column(Text, primary_key=True, nullable=False)
+    ts = Column(TIMESTAMP(timezone=True), primary_key=True, nullable=False)
+    open = Column(REAL)
+    high = Column(REAL)
+    low = Column(REAL)
+    close = Column(REAL, nullable=False)
+    volume = Column(Float)          # fractional for crypto
+
+
+class QuarantinedRow(Base):
+    __tablename__ = "ingestion_quarantine"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(Text, nullable=False)
+    key = Column(Text)
+    date = Column(TIMESTAMP(timezone=True))
+    reason = Column(Text, nullable=False)
+    payload = Column(JSONB)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text('NOW()'))
\ No newline at end of file
@@ -45,6 +45,9 @@ CREATE TABLE IF NOT EXISTS news_sentiment(
     PRIMARY KEY (id, published_at)  -- include published_at
 );
 
+CREATE UNIQUE INDEX IF NOT EXISTS uq_news_sentiment_ticker_headline_published
+    ON news_sentiment (ticker, headline, published_at);
+
 CREATE TABLE IF NOT EXISTS anomalies(
     id SERIAL,
     ticker TEXT,
@@ -111,10 +114,59 @@ CREATE TABLE IF NOT EXISTS features(
 
 );
 
+CREATE TABLE IF NOT EXISTS market_bars_intraday(
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,          -- '1m', '1h'
+    ts TIMESTAMPTZ NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL NOT NULL,
+    volume DOUBLE PRECISION,         -- fractional for crypto
+
+    PRIMARY KEY (ticker, interval, ts)
+);
+
+-- Optional feature packs (ingestion/feature_pack.py), one row per feature value
+CREATE TABLE IF NOT EXISTS feature_values(
+    ticker TEXT NOT NULL,
+    date DATE NOT NULL,
+    feature TEXT NOT NULL,
+    value DOUBLE PRECISION,
+
+    PRIMARY KEY (ticker, date, feature)
+);
+
+CREATE INDEX IF NOT EXISTS idx_feature_values_feature_date ON feature_values (feature, date DESC);
+
+CREATE TABLE IF NOT EXISTS ingestion_quarantine(
+    id SERIAL PRIMARY KEY,
+    source TEXT NOT NULL,            -- 'prices', 'crypto', 'macro'
+    key TEXT,                        -- ticker / symbol / series_id
+    date TIMESTAMPTZ,
+    reason TEXT NOT NULL,            -- comma-separated rule codes
+    payload JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- rejected rows are refetched on every run until fixed upstream; record each once
+CREATE UNIQUE INDEX IF NOT EXISTS uq_ingestion_quarantine_source_key_date_reason
+    ON ingestion_quarantine (source, key, date, reason);
+
 -- Hypertables for time-series performance
 SELECT create_hypertable('market_data', 'date', if_not_exists => TRUE);
 SELECT create_hypertable('crypto_prices', 'date', if_not_exists => TRUE);
 SELECT create_hypertable('news_sentiment', 'published_at', if_not_exists => TRUE);
 SELECT create_hypertable('anomalies', 'created_at', if_not_exists => TRUE);
 SELECT create_hypertable('forecasts', 'forecast_date', if_not_exists => TRUE);
-SELECT create_hypertable('features', 'date', if_not_exists => TRUE);
\ No newline at end of file
+SELECT create_hypertable('features', 'date', if_not_exists => TRUE);
+SELECT create_hypertable('feature_values', 'date', if_not_exists => TRUE);
+SELECT create_hypertable('market_bars_intraday', 'ts', chunk_time_interval => INTERVAL '1 day', if_not_exists => TRUE);
+
+-- Intraday chunks older than a week are compressed column-wise per ticker
+ALTER TABLE market_bars_intraday SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'ticker, interval',
+    timescaledb.compress_orderby = 'ts DESC'
+);
+SELECT add_compression_policy('market_bars_intraday', INTERVAL '7 days', if_not_exists => TRUE);
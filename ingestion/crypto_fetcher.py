@@ -4,10 +4,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import ccxt
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from database.connection import get_session
-from database.crud import insert_crypto_prices
+from database.crud import get_latest_dates, get_recent_closes
+from database.bulk_loader import copy_crypto_prices
+from database.batch_writer import write_batches
+from database.models import CryptoPrice
+from ingestion.progress_journal import ProgressJournal
+from ingestion.ingestion_engine import TokenBucket, run_concurrent, summarize
+from ingestion.data_quality import JUMP_WINDOW, validate_ohlcv, quarantine, report
 
 SYMBOLS = {
     "BTC/USDT": "BTC-USD",
@@ -18,55 +25,172 @@ SYMBOLS = {
 }
 
 EXCHANGE = "binance"
+# Tried in order: each symbol is fetched from the first exchange that lists it
+EXCHANGES = [EXCHANGE]
 TIMEFRAME = "1d"
-LIMIT = 365
-
-
-def fetch_ohlcv(exchange, symbol: str) -> list:
-    raw = exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, limit=LIMIT)
-    return raw   
-
-
-def transform(raw: list, symbol: str) -> list[dict]:
-
-    record = []
-    for row in raw:
-        record.append({
-            'symbol': symbol,
-            'date': datetime.fromtimestamp(row[0] / 1000, tz=timezone.utc).date(),
-            "open":   row[1],
-            "high":   row[2],
-            "low":    row[3],
-            "close":  row[4],
-            "volume": row[5],
-            }
-        )
-
-    return record
-
-
-def run():
-    exchange = ccxt.binance()
-    session = get_session()
-    try:
-        for symbol, name in SYMBOLS.items():
-            print(f"[{symbol}] fetching '{name}'....")
-            try:
-                raw = fetch_ohlcv(exchange,     symbol)
-                records = transform(raw, symbol)
-
-                if not records:
-                    print(f'[{symbol}] No Valid Records, Skipping.')
-                    continue
-
-                insert_crypto_prices(session, records)
-                print(f'[{symbol}] Inserted {len(records)} records')
-            
-            except Exception as e:
-                print(f'[{symbol} Unexpected Error: {e}]')
-                session.rollback()
-    finally:
-        session.close()
+
+TIMEFRAME_MS = {"1m": 60_000, "5m": 300_000, "15m": 900_000, "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000}
+PAGE_LIMIT = 1000                 # candles per request; exchanges may return fewer
+BACKFILL_START = "2017-01-01"     # first candle requested when nothing is stored yet
+MAX_WORKERS = 4
+
+# "incremental" pages from the day after the last stored date per symbol;
+# "backfill" pages through the whole history from BACKFILL_START.
+MODE = "incremental"
+
+
+def fetch_ohlcv(exchange, symbol: str, since: int | None = None, limit: int = PAGE_LIMIT) -> list:
+    """One page of candles from `since`; fetch_ohlcv_paginated walks these."""
+    return exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, since=since, limit=limit)
+
+
+def fetch_ohlcv_paginated(exchange, symbol: str, since: int | None = None,
+                          until: int | None = None, limiter: TokenBucket | None = None) -> list:
+    """
+    Walk `since` cursors page by page until `until` (default: now), an
+    empty page, or a page that does not advance the cursor.
+    """
+    step = TIMEFRAME_MS[TIMEFRAME]
+    cursor = since if since is not None else int(pd.Timestamp(BACKFILL_START, tz="UTC").timestamp() * 1000)
+    until = until or int(datetime.now(timezone.utc).timestamp() * 1000)
+
+    rows = []
+    while cursor <= until:
+        if limiter is not None:
+            limiter.acquire()
+        page = fetch_ohlcv(exchange, symbol, since=cursor)
+        if not page:
+            break
+        rows.extend(page)
+        next_cursor = int(page[-1][0]) + step
+        if next_cursor <= cursor:
+            break
+        cursor = next_cursor
+    return rows
+
+
+def make_exchange(name: str):
+    # throttling is done by our own per-exchange TokenBucket, shared across threads
+    return getattr(ccxt, name)({"enableRateLimit": False})
+
+
+def exchange_limiter(exchange) -> TokenBucket:
+    """Token bucket honouring the exchange's declared ccxt `rateLimit` (ms between requests)."""
+    rate_limit_ms = getattr(exchange, "rateLimit", None) or 1000
+    return TokenBucket(rate=1000 / rate_limit_ms, burst=1)
+
+
+def assign_exchanges(exchanges: list, symbols: list[str]) -> dict:
+    """Map each symbol to the first exchange whose markets list it."""
+    assigned = {}
+    for exchange in exchanges:
+        try:
+            markets = exchange.load_markets()
+        except Exception as e:
+            print(f"[{getattr(exchange, 'id', exchange)}] Could not load markets: {e}")
+            continue
+        for symbol in symbols:
+            if symbol not in assigned and symbol in markets:
+                assigned[symbol] = exchange
+    return assigned
+
+
+def get_since(session, symbols: list[str], mode: str = MODE) -> dict:
+    """Per-symbol `since` in epoch ms: midnight UTC after the stored watermark, or None."""
+    if mode == "backfill":
+        return {s: None for s in symbols}
+    if mode != "incremental":
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'backfill'")
+
+    watermarks = get_latest_dates(session, CryptoPrice, "symbol")
+    since = {}
+    for symbol in symbols:
+        last = watermarks.get(symbol)
+        if last is None:
+            since[symbol] = None
+            continue
+        next_day = pd.Timestamp(last).date() + timedelta(days=1)
+        start = datetime(next_day.year, next_day.month, next_day.day, tzinfo=timezone.utc)
+        since[symbol] = int(start.timestamp() * 1000)
+    return since
+
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def transform(raw: list, symbol: str) -> pd.DataFrame:
+    """Columnar transform: ccxt OHLCV rows -> crypto_prices columns in one array conversion."""
+    arr = np.asarray(raw, dtype="float64").reshape(-1, len(OHLCV_COLUMNS))
+
+    df = pd.DataFrame({
+        "symbol": symbol,
+        "date":   pd.to_datetime(arr[:, 0], unit="ms", utc=True).tz_convert(None).normalize(),
+        "open":   arr[:, 1],
+        "high":   arr[:, 2],
+        "low":    arr[:, 3],
+        "close":  arr[:, 4],
+        "volume": arr[:, 5],
+    })
+
+    mask = ~(np.isnan(arr[:, 0]) | np.isnan(arr[:, 4]))
+    return df[mask].reset_index(drop=True)
+
+
+def run(mode: str = MODE, resume: bool = True, exchanges: list | None = None,
+        workers: int = MAX_WORKERS) -> list[dict]:
+    """
+    `exchanges` are ccxt exchange ids or exchange objects (anything with
+    load_markets / fetch_ohlcv / rateLimit, so a fake works offline).
+    """
+    exchanges = [make_exchange(e) if isinstance(e, str) else e for e in (exchanges or EXCHANGES)]
+    limiters = {id(e): exchange_limiter(e) for e in exchanges}
+    today = datetime.now(timezone.utc).date()
+
+    # symbols finished by an earlier, interrupted run for the same mode/day are skipped
+    journal = ProgressJournal("crypto", run_key=f"{mode}:{today}") if resume else None
+    symbols = journal.pending(list(SYMBOLS)) if journal is not None else list(SYMBOLS)
+
+    assigned = assign_exchanges(exchanges, symbols)
+    for symbol in symbols:
+        if symbol not in assigned:
+            print(f"[{symbol}] Not listed on any of {[getattr(e, 'id', e) for e in exchanges]}, skipping.")
+    symbols = [s for s in symbols if s in assigned]
+
+    with get_session() as session:
+        since = get_since(session, symbols, mode)
+        prior = get_recent_closes(session, CryptoPrice, "symbol", symbols, JUMP_WINDOW)
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+        def fetch(symbol: str) -> list:
+            if since[symbol] is not None and since[symbol] > now_ms:
+                return []
+            exchange = assigned[symbol]
+            print(f"[{symbol}] fetching '{SYMBOLS[symbol]}' from {getattr(exchange, 'id', exchange)}....")
+            return fetch_ohlcv_paginated(exchange, symbol, since[symbol], now_ms, limiters[id(exchange)])
+
+        def write(symbol: str, raw: list) -> int:
+            frame, rejected, counts = validate_ohlcv(transform(raw, symbol), key_col="symbol", prior=prior)
+            report(symbol, counts)
+            quarantine(session, rejected, "crypto", "symbol")
+
+            written = 0
+            if frame.empty:
+                print(f'[{symbol}] No new records, skipping.')
+            else:
+                stats = write_batches(session, copy_crypto_prices, frame, label=symbol)
+                written = stats["written"]
+                print(f'[{symbol}] Inserted {written} records')
+
+            if journal is not None:
+                journal.mark_done(symbol, since[symbol], today, rows=written)
+                print(journal.report())
+            return written
+
+        # per-exchange token buckets throttle inside fetch(), so no global rate here
+        stats = run_concurrent(symbols, fetch, write, workers=workers, rate=None)
+
+    print(f"Crypto ingestion summary: {summarize(stats)}")
+    return stats
 
 
 if __name__ == "__main__":
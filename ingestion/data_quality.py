@@ -0,0 +1,188 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import json
+import numpy as np
+import pandas as pd
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# |log(close / reference)| above this is treated as a bad print, not a move (~ +172% / -63%)
+MAX_ABS_LOG_RETURN = 1.0
+# The reference is the median of a centred window of this many closes of the
+# same key, so a single bad print cannot drag the reference for its neighbours.
+JUMP_WINDOW = 5
+
+# Rule name -> bit in the per-row reason mask. Order is the reporting order.
+OHLCV_RULES = [
+    "missing_close",
+    "non_positive_close",
+    "non_positive_price",
+    "high_below_low",
+    "close_outside_range",
+    "negative_volume",
+    "duplicate_date",
+    "price_jump",
+]
+SERIES_RULES = [
+    "missing_value",
+    "non_finite_value",
+    "duplicate_date",
+]
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray | None:
+    if name not in df.columns:
+        return None
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _duplicates(df: pd.DataFrame, key_col: str, date_col: str) -> np.ndarray:
+    return df.duplicated(subset=[key_col, date_col], keep="first").to_numpy()
+
+
+def _split(df: pd.DataFrame, reasons: np.ndarray, rules: list[str]) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    bad = reasons != 0
+    counts = {rule: int(np.count_nonzero(reasons & (1 << bit))) for bit, rule in enumerate(rules)}
+    counts["rows"] = len(df)
+    counts["rejected"] = int(np.count_nonzero(bad))
+
+    rejected = df[bad].copy()
+    if len(rejected):
+        codes = reasons[bad]
+        rejected["reason"] = [
+            ",".join(rule for bit, rule in enumerate(rules) if code & (1 << bit))
+            for code in codes
+        ]
+    return df[~bad], rejected, counts
+
+
+def _price_jumps(keys: np.ndarray, dates: np.ndarray, close: np.ndarray, rows: np.ndarray,
+                 prior: dict, max_abs_log_return: float) -> np.ndarray:
+    """
+    Rows (of `rows`, those that passed the other rules) whose log close is
+    more than max_abs_log_return from the median of the key's closes in a
+    centred window of JUMP_WINDOW: stored history from `prior`, then the
+    batch in date order. A lone bad print cannot move that median, so
+    only the print is flagged and not the good row after it, and a one-row
+    incremental batch is still checked against stored history.
+    """
+    seed = pd.DataFrame(
+        [(k, np.log(c), -1) for k, closes in prior.items() for c in closes[-JUMP_WINDOW:] if c and c > 0],
+        columns=["k", "c", "row"],
+    )
+    batch = (
+        pd.DataFrame({"k": keys[rows], "d": dates[rows], "c": np.log(close[rows]), "row": rows})
+        .sort_values(["k", "d"], kind="mergesort")
+        .drop(columns="d")
+    )
+    # stable sort on the key alone keeps each key's seed rows ahead of its batch rows
+    seq = pd.concat([f for f in (seed, batch) if not f.empty], ignore_index=True)
+    seq = seq.sort_values("k", kind="mergesort")
+    if seq.empty:
+        return rows[:0]
+
+    reference = (
+        seq.groupby("k", sort=False)["c"]
+        .rolling(JUMP_WINDOW, center=True, min_periods=3).median()
+        .reset_index(level=0, drop=True)
+    )
+    row = seq["row"].to_numpy()
+    jump = (seq["c"] - reference).abs().to_numpy() > max_abs_log_return
+    return row[jump & (row >= 0)].astype(np.int64)
+
+
+def validate_ohlcv(df: pd.DataFrame, key_col: str = "ticker", date_col: str = "date",
+                   max_abs_log_return: float = MAX_ABS_LOG_RETURN,
+                   prior: dict | None = None) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Vectorized OHLCV checks over a whole batch. Returns (clean, rejected,
+    counts); `rejected` carries a comma-separated `reason` column and
+    `counts` has the number of rows failing each rule. `prior` maps a key
+    to its last stored closes (oldest first, crud.get_recent_closes), so
+    the jump rule also covers the first rows of an incremental batch.
+    """
+    n = len(df)
+    reasons = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return _split(df, reasons, OHLCV_RULES)
+
+    bit = {rule: np.int64(1 << i) for i, rule in enumerate(OHLCV_RULES)}
+    close = _column(df, "close")
+    open_, high, low = _column(df, "open"), _column(df, "high"), _column(df, "low")
+    volume = _column(df, "volume")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        reasons |= np.where(np.isnan(close), bit["missing_close"], 0)
+        reasons |= np.where(close <= 0, bit["non_positive_close"], 0)
+        for col in (open_, high, low):
+            if col is not None:
+                reasons |= np.where(col <= 0, bit["non_positive_price"], 0)
+        if high is not None and low is not None:
+            reasons |= np.where(high < low, bit["high_below_low"], 0)
+            tol = 1e-6 * np.abs(close)
+            reasons |= np.where((close > high + tol) | (close < low - tol), bit["close_outside_range"], 0)
+        if volume is not None:
+            reasons |= np.where(volume < 0, bit["negative_volume"], 0)
+        reasons |= np.where(_duplicates(df, key_col, date_col), bit["duplicate_date"], 0)
+
+        flagged = _price_jumps(df[key_col].to_numpy(), df[date_col].to_numpy(), close,
+                               np.flatnonzero(reasons == 0), prior or {}, max_abs_log_return)
+        reasons[flagged] |= bit["price_jump"]
+
+    return _split(df, reasons, OHLCV_RULES)
+
+
+def validate_series(df: pd.DataFrame, key_col: str = "series_id", date_col: str = "date",
+                    value_col: str = "value") -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """Checks for single-value series (macro indicators); same return shape as validate_ohlcv."""
+    n = len(df)
+    reasons = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return _split(df, reasons, SERIES_RULES)
+
+    bit = {rule: np.int64(1 << i) for i, rule in enumerate(SERIES_RULES)}
+    value = _column(df, value_col)
+    reasons |= np.where(np.isnan(value), bit["missing_value"], 0)
+    reasons |= np.where(np.isinf(value), bit["non_finite_value"], 0)
+    reasons |= np.where(_duplicates(df, key_col, date_col), bit["duplicate_date"], 0)
+    return _split(df, reasons, SERIES_RULES)
+
+
+def to_quarantine_rows(rejected: pd.DataFrame, source: str, key_col: str, date_col: str = "date") -> list[dict]:
+    if rejected.empty:
+        return []
+    payloads = json.loads(rejected.drop(columns=["reason"]).to_json(orient="records", date_format="iso"))
+    return [
+        {
+            "source":  source,
+            "key":     str(key),
+            "date":    pd.Timestamp(d).to_pydatetime() if pd.notna(d) else None,
+            "reason":  reason,
+            "payload": payload,
+        }
+        for key, d, reason, payload in zip(rejected[key_col], rejected[date_col], rejected["reason"], payloads)
+    ]
+
+
+def quarantine(session, rejected: pd.DataFrame, source: str, key_col: str, date_col: str = "date") -> int:
+    """Write rejected rows to ingestion_quarantine with their reason codes."""
+    from database.crud import insert_quarantine
+
+    rows = to_quarantine_rows(rejected, source, key_col, date_col)
+    if not rows:
+        return 0
+    try:
+        return insert_quarantine(session, rows)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"[{source}] could not quarantine {len(rows)} rows: {e}")
+        return 0
+
+
+def report(label: str, counts: dict) -> None:
+    failed = {k: v for k, v in counts.items() if k not in ("rows", "rejected") and v}
+    if counts["rejected"]:
+        print(f"[{label}] quality gate: {counts['rejected']}/{counts['rows']} rows quarantined {failed}")
@@ -5,12 +5,28 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 import pandas as pd
 import numpy as np
 from database.connection import get_session
-from database.crud import get_latest_prices
+from database.crud import get_latest_prices, get_prices_after
 from database.crud import insert_features
 from database.crud import get_all_tickers
-
-def fetch_price_data(ticker: str, session, limit: int = 100) -> pd.DataFrame:
-    rows = get_latest_prices(session, ticker, limit)
+from database.crud import get_latest_dates
+from database.models import Features, MarketData
+from database.batch_writer import write_batches, iter_records
+from ingestion.feature_registry import compute, lookback, stored_features, pack_features
+from ingestion.feature_pack import attach_benchmark, load_benchmark, write_pack
+from ml.feature_store import notify_written
+
+MODE = "incremental"         # "incremental" | "full"
+FULL_ROWS = 500              # price rows per ticker in a full recompute
+# Rows loaded before the last stored feature date in incremental mode: the
+# longest declared lookback in the registry (the RSI EWM warm-up).
+LOOKBACK_ROWS = lookback(stored_features())
+# Opt-in feature packs written to feature_values, e.g. ["risk"]. After
+# enabling one, run mode="full" once to fill the existing history.
+FEATURE_PACKS = []
+
+PRICE_COLUMNS = ["ticker", "date", "open", "high", "low", "close", "volume"]
+
+def _to_frame(rows) -> pd.DataFrame:
     records = [
         {
             "ticker": row.ticker,
@@ -23,11 +39,17 @@ def fetch_price_data(ticker: str, session, limit: int = 100) -> pd.DataFrame:
         }
         for row in rows
     ]
-    df = pd.DataFrame(records)
+    df = pd.DataFrame(records, columns=PRICE_COLUMNS)
     for col in ["open", "high", "low", "close", "volume"]:
         df[col] = df[col].astype(float)
     return df
 
+def fetch_price_data(ticker: str, session, limit: int = 100) -> pd.DataFrame:
+    return _to_frame(get_latest_prices(session, ticker, limit))
+
+def fetch_price_window(ticker: str, session, after, lookback: int = LOOKBACK_ROWS) -> pd.DataFrame:
+    return _to_frame(get_prices_after(session, ticker, after, lookback))
+
 def compute_log_returns(df: pd.DataFrame) -> pd.DataFrame:
 
     if df is None or df.empty:
@@ -117,37 +139,87 @@ def compute_volume_ratio(df: pd.DataFrame, window: int = 20) -> pd.DataFrame:
     return df
 
 def write_features(session, df: pd.DataFrame) -> None:
-    cols_to_drop = ["open", "high", "low", "close", "volume"]
-    df = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
+    df = df[["ticker", "date"] + stored_features()]
     df = df.dropna()
     if df.empty:
         return
-    records = df.to_dict(orient="records")
-
     try:
-        insert_features(session, records)
-        print(f"Inserted {len(records)} feature rows")
+        stats = write_batches(session, insert_features, iter_records(df))
+        print(f"Inserted {stats['written']} feature rows")
     except Exception as e:
         print(f'Error: {e}')
+        return
+    notify_written(df["ticker"].unique().tolist())
+
+def compute_features(df: pd.DataFrame, features: list[str] | None = None) -> pd.DataFrame:
+    """
+    Registry-driven equivalent of compute_log_returns -> compute_lag_features
+    -> compute_rolling_stats -> compute_rsi -> compute_bollinger ->
+    compute_volume_ratio (all stored features by default), with one sort and
+    shared rolling passes; see ingestion.feature_registry.
+    """
+    return compute(df, features)
+
+def main(mode: str = MODE, panel: bool = False, packs: list[str] | None = None,
+         workers: int | None = None) -> None:
+    """
+    incremental: per ticker, load LOOKBACK_ROWS of warm-up before the last
+    stored feature date plus the new price rows, and write only the new
+    dates. Tickers with no features yet, and mode="full", recompute over
+    the latest FULL_ROWS prices. panel=True does the same for all tickers
+    in one query / one vectorized pass / one COPY (ingestion.feature_panel).
+    `packs` (default FEATURE_PACKS) adds opt-in features to feature_values.
+    workers=N shards the panel across N processes (ingestion.feature_pool).
+    """
+    if mode not in ("incremental", "full"):
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'full'")
+    packs = FEATURE_PACKS if packs is None else packs
+    if workers:
+        from ingestion.feature_pool import run
+        run(mode, packs=packs, workers=workers)
+        return
+    if panel:
+        from ingestion.feature_panel import run
+        run(mode, packs=packs)
+        return
 
-def main() -> None:
-
+    extra = pack_features(packs)
     with get_session() as session:
         tickers = get_all_tickers(session)
+        feature_dates = get_latest_dates(session, Features, "ticker") if mode == "incremental" else {}
+        price_dates = get_latest_dates(session, MarketData, "ticker") if mode == "incremental" else {}
+        benchmark = load_benchmark() if extra else {}
+
         for ticker in tickers:
+            last = feature_dates.get(ticker)
+            if last is not None and price_dates.get(ticker) is not None and price_dates[ticker] <= last:
+                print(f"Up to date: {ticker}")
+                continue
             try:
-                df = fetch_price_data(ticker, session, limit=500)
-                df = compute_log_returns(df)
-                df = compute_lag_features(df)
-                df = compute_rolling_stats(df)
-                df = compute_rsi(df)
-                df = compute_bollinger(df)
-                df = compute_volume_ratio(df)
+                if last is None:
+                    df = fetch_price_data(ticker, session, limit=FULL_ROWS)
+                else:
+                    df = fetch_price_window(ticker, session, last)
+                if extra:
+                    df = attach_benchmark(df, benchmark)
+                df = compute_features(df, stored_features() + extra)
+                if last is not None:
+                    df = df[df["date"] > last]
                 write_features(session, df)
+                if extra:
+                    print(f"Inserted {write_pack(session, df, extra)} {', '.join(packs)} pack values")
                 print(f"Done: {ticker}")
             except Exception as e:
                 print(f"Failed {ticker}: {e}")
                 continue
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute features from stored prices")
+    parser.add_argument("mode", nargs="?", default=MODE, choices=["incremental", "full"])
+    parser.add_argument("--panel", action="store_true", help="all tickers in one vectorized pass")
+    parser.add_argument("--pack", action="append", dest="packs", help="opt-in feature pack, e.g. risk")
+    parser.add_argument("--workers", type=int, help="compute across a process pool of this size")
+    args = parser.parse_args()
+    main(args.mode, panel=args.panel, packs=args.packs, workers=args.workers)
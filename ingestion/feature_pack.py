@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+from ingestion import indicators
+
+# Opt-in risk features, stored long in feature_values rather than as columns
+# of features. Every function works on 1-D series or (tickers, obs) grids,
+# time on the last axis, so the per-ticker loop and the panel engine share them.
+
+# Fetched on its own by load_benchmark, not part of the ingestion universe
+# (price_fetcher.TICKERS), so it never gets features, news or forecasts.
+BENCHMARK_TICKER = "SPY"
+LN2 = np.log(2.0)
+
+
+def _mean(x: np.ndarray, window: int) -> np.ndarray:
+    return indicators.rolling(x, window, "mean")
+
+
+def parkinson_vol(high: np.ndarray, low: np.ndarray, window: int = 21) -> np.ndarray:
+    """Daily Parkinson volatility from the high/low range."""
+    return np.sqrt(_mean(np.log(high / low) ** 2, window) / (4 * LN2))
+
+
+def garman_klass_vol(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     window: int = 21) -> np.ndarray:
+    """Daily Garman-Klass volatility from open/high/low/close."""
+    term = 0.5 * np.log(high / low) ** 2 - (2 * LN2 - 1) * np.log(close / open_) ** 2
+    return np.sqrt(np.maximum(_mean(term, window), 0.0))
+
+
+def downside_semivariance(returns: np.ndarray, window: int = 21) -> np.ndarray:
+    """Realized downside semivariance: sum of squared negative returns in the window."""
+    down = np.where(returns < 0, returns ** 2, np.where(np.isnan(returns), np.nan, 0.0))
+    return _mean(down, window) * window
+
+
+def rolling_beta(returns: np.ndarray, benchmark_returns: np.ndarray, window: int = 63) -> np.ndarray:
+    """OLS beta of returns on the benchmark's returns over the window."""
+    mean_r, mean_m = _mean(returns, window), _mean(benchmark_returns, window)
+    cov = _mean(returns * benchmark_returns, window) - mean_r * mean_m
+    var = _mean(benchmark_returns ** 2, window) - mean_m ** 2
+    return cov / var
+
+
+def rolling_autocorr(returns: np.ndarray, window: int = 21, lag: int = 1) -> np.ndarray:
+    """Correlation of returns with themselves `lag` rows earlier, within the window."""
+    lagged = np.full(np.shape(returns), np.nan)
+    lagged[..., lag:] = returns[..., :-lag]
+    mean_x, mean_y = _mean(returns, window), _mean(lagged, window)
+    cov = _mean(returns * lagged, window) - mean_x * mean_y
+    var_x = _mean(returns ** 2, window) - mean_x ** 2
+    var_y = _mean(lagged ** 2, window) - mean_y ** 2
+    return cov / np.sqrt(var_x * var_y)
+
+
+def to_long(frame: pd.DataFrame, features: list[str]) -> pd.DataFrame:
+    """(ticker, date, feature, value) rows for feature_values, NaNs dropped."""
+    return (
+        frame.melt(id_vars=["ticker", "date"], value_vars=features, var_name="feature", value_name="value")
+        .dropna(subset=["value"])
+    )
+
+
+def write_pack(session, frame: pd.DataFrame, features: list[str]) -> int:
+    from database.bulk_loader import copy_feature_values
+
+    if not features or frame.empty:
+        return 0
+    rows = to_long(frame, features)
+    return copy_feature_values(session, rows) if not rows.empty else 0
+
+
+def load_benchmark(start=None) -> dict:
+    """{date: close} for BENCHMARK_TICKER from `start` (default: the price fetcher's full PERIOD)."""
+    from ingestion.price_fetcher import fetch_ticker, transform
+
+    raw = fetch_ticker(BENCHMARK_TICKER, start=pd.Timestamp(start).date() if start is not None else None)
+    if raw is None or raw.empty:
+        return {}
+    bars = transform(raw, BENCHMARK_TICKER)
+    return dict(zip(bars["date"].dt.date, bars["close"]))
+
+
+def attach_benchmark(df: pd.DataFrame, closes: dict | None = None) -> pd.DataFrame:
+    """
+    Add a `benchmark_close` column aligned on date from {date: close},
+    loaded with load_benchmark from the frame's first date if not given.
+    """
+    if closes is None:
+        closes = load_benchmark(pd.to_datetime(df["date"]).min())
+    bench = pd.Series(closes, dtype=float)
+    bench.index = pd.to_datetime(bench.index)
+    df["benchmark_close"] = pd.to_datetime(df["date"]).map(bench).to_numpy(dtype=float)
+    return df
@@ -0,0 +1,207 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import time
+import numpy as np
+import pandas as pd
+from database.connection import get_session
+from database.crud import get_price_panel
+from database.bulk_loader import copy_features
+from ingestion.feature_engineer import MODE, FULL_ROWS, LOOKBACK_ROWS
+from ingestion.feature_registry import PRICE_INPUTS, evaluate, pack_features, stored_features
+from ingestion.feature_pack import attach_benchmark, write_pack
+from ingestion import indicators
+from ml.feature_store import notify_written
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+FEATURE_COLUMNS = stored_features()
+LAGS = [1, 5, 21, 63]
+
+
+def _grid_index(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Row -> (ticker number, position within ticker) for a frame sorted by (ticker, date)."""
+    g = df.groupby("ticker", sort=False)
+    return g.ngroup().to_numpy(), g.cumcount().to_numpy()
+
+
+def _to_grid(values, codes: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    grid = np.full((codes.max() + 1, pos.max() + 1), np.nan)
+    grid[codes, pos] = np.asarray(values, dtype=float)
+    return grid
+
+
+def compute_pack(df: pd.DataFrame, features: list[str]) -> pd.DataFrame:
+    """
+    Add opt-in pack features to a frame returned by compute_panel: price
+    columns go onto (ticker, position) grids and the registry evaluates
+    the pack on all tickers at once.
+    """
+    codes, pos = _grid_index(df)
+    values = {col: _to_grid(df[col], codes, pos) for col in PRICE_INPUTS if col in df.columns}
+    values = evaluate(values, features)
+    for name in features:
+        df[name] = values[name][codes, pos]
+    return df
+
+
+def compute_panel(df: pd.DataFrame, rsi_window: int = 14, bb_window: int = 20,
+                  bb_std: float = 2.0, volume_window: int = 20) -> pd.DataFrame:
+    """
+    Same features as feature_engineer.compute_features, for every ticker of
+    a long (ticker, date, OHLCV) frame at once. Rolling windows run over the
+    whole sorted column and windows that would straddle two tickers are
+    masked by each row's position within its ticker; shifts and the RSI EWM
+    are grouped, and the RSI runs on a 2-D grid via ingestion.indicators.
+    """
+    if df is None or df.empty:
+        raise ValueError("DataFrame is empty or None")
+
+    df = df.sort_values(["ticker", "date"], kind="mergesort").reset_index(drop=True)
+    for col in PRICE_COLUMNS:
+        df[col] = df[col].astype(float)
+
+    g = df.groupby("ticker", sort=False)
+    codes, pos = _grid_index(df)
+    close = df["close"]
+    prev_close = g["close"].shift(1)
+
+    # the first log_return of each ticker is NaN, so any 21-row window
+    # reaching back into the previous ticker is NaN without extra masking
+    df["log_return"] = np.log(close / prev_close)
+    lr = df.groupby("ticker", sort=False)["log_return"]
+    for k in LAGS:
+        df[f"lag_{k}d"] = lr.shift(k)
+
+    rolling = df["log_return"].rolling(21)
+    df["rolling_mean_21"] = rolling.mean()
+    df["rolling_std_21"] = rolling.std()
+    df["rolling_skew_21"] = rolling.skew()
+
+    # RSI on a (ticker, position) grid: one compiled call for every ticker
+    df[f"rsi_{rsi_window}"] = indicators.rsi(_to_grid(close, codes, pos), rsi_window)[codes, pos]
+
+    mean = close.rolling(bb_window).mean()
+    std = close.rolling(bb_window).std()
+    upper, lower = mean + bb_std * std, mean - bb_std * std
+    df["bb_pct_b"] = np.where(pos >= bb_window - 1, (close - lower) / (upper - lower), np.nan)
+
+    avg_volume = df["volume"].rolling(volume_window).mean().shift(1)
+    df["volume_ratio"] = np.where(pos >= volume_window, df["volume"] / avg_volume, np.nan)
+
+    return df
+
+
+def new_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows dated after each ticker's `last_feature` (all rows where it is null)."""
+    if "last_feature" not in df.columns:
+        return df
+    dates = pd.to_datetime(df["date"])
+    last = pd.to_datetime(df["last_feature"])
+    return df[last.isna().to_numpy() | (dates > last).to_numpy()]
+
+
+def select_new(df: pd.DataFrame) -> pd.DataFrame:
+    """Complete feature rows dated after each ticker's `last_feature`."""
+    return new_rows(df)[["ticker", "date"] + FEATURE_COLUMNS].dropna()
+
+
+def run(mode: str = MODE, tickers: list[str] | None = None, packs: list[str] | None = None) -> int:
+    """Load all tickers in one query, compute the panel and write it with one COPY."""
+    if mode not in ("incremental", "full"):
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'full'")
+    extra = pack_features(packs or [])
+
+    with get_session() as session:
+        t0 = time.perf_counter()
+        prices = get_price_panel(session, tickers, FULL_ROWS, LOOKBACK_ROWS,
+                                 incremental=mode == "incremental")
+        if prices.empty:
+            print("Features up to date for all tickers.")
+            return 0
+        if extra:
+            prices = attach_benchmark(prices)
+        t1 = time.perf_counter()
+
+        computed = compute_panel(prices)
+        if extra:
+            computed = compute_pack(computed, extra)
+        frame = select_new(computed)
+        t2 = time.perf_counter()
+
+        written = copy_features(session, frame) if not frame.empty else 0
+        if written:
+            notify_written(frame["ticker"].unique().tolist())
+        if extra:
+            pack_written = write_pack(session, new_rows(computed), extra)
+            print(f"Inserted {pack_written} {', '.join(packs)} pack values")
+        t3 = time.perf_counter()
+
+    print(f"Panel features: {prices['ticker'].nunique()} tickers, {len(prices)} price rows, "
+          f"{written} feature rows written "
+          f"(load {t1 - t0:.2f}s, compute {t2 - t1:.2f}s, write {t3 - t2:.2f}s)")
+    return written
+
+
+def _synthetic_prices(n_tickers: int, n_days: int) -> pd.DataFrame:
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_tickers, n_days)), axis=1))
+    return pd.DataFrame({
+        "ticker": np.repeat([f"BENCH{i:04d}" for i in range(n_tickers)], n_days),
+        "date":   np.tile(dates.date, n_tickers),
+        "open":   (close * 0.99).ravel(),
+        "high":   (close * 1.01).ravel(),
+        "low":    (close * 0.98).ravel(),
+        "close":  close.ravel(),
+        "volume": rng.integers(1_000, 1_000_000, n_tickers * n_days).astype(float),
+    })
+
+
+def benchmark(sizes: tuple[int, ...] = (10, 100, 1000), n_days: int = FULL_ROWS) -> list[dict]:
+    """
+    Per-ticker loop (feature_engineer.compute_features) vs compute_panel on
+    synthetic prices, compute only. Equality of the two is covered by
+    tests/test_feature_panel.py.
+    """
+    from ingestion.feature_engineer import compute_features
+
+    results = []
+    for n in sizes:
+        df = _synthetic_prices(n, n_days)
+
+        t0 = time.perf_counter()
+        pd.concat(
+            [compute_features(group.copy()) for _, group in df.groupby("ticker", sort=True)],
+            ignore_index=True,
+        )
+        loop_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        compute_panel(df)
+        panel_s = time.perf_counter() - t0
+
+        results.append({
+            "tickers":      n,
+            "rows":         len(df),
+            "loop_s":       loop_s,
+            "panel_s":      panel_s,
+            "speedup":      loop_s / panel_s,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute features for all tickers as one panel")
+    parser.add_argument("mode", nargs="?", default=MODE, choices=["incremental", "full"])
+    parser.add_argument("--pack", action="append", dest="packs", help="opt-in feature pack, e.g. risk")
+    parser.add_argument("--benchmark", action="store_true", help="compare with the per-ticker loop at 10/100/1000 tickers")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for row in benchmark():
+            print(row)
+    else:
+        run(args.mode, packs=args.packs)
@@ -0,0 +1,195 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from ingestion.feature_registry import PRICE_INPUTS, evaluate, stored_features
+
+POOL_WORKERS  = os.cpu_count() or 1
+SHARD_TICKERS = 32           # tickers per task handed to a worker
+# Workers are spawned, never forked: run() is called from run_pipeline's thread
+# pool with torch threads and a psycopg2 connection open, and forking a
+# multithreaded process can deadlock and hands the DB socket to the children.
+# They only need the shared-memory names, so nothing else has to be inherited.
+POOL_CONTEXT  = "spawn"
+
+# Set in each worker by _attach: views over the shared price / feature blocks.
+_worker = {}
+
+
+def _attach(in_name: str, in_shape: tuple, out_name: str, out_shape: tuple,
+            columns: list[str], names: list[str]) -> None:
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    _worker.update(
+        shm=(shm_in, shm_out),             # keep the mappings alive for the views
+        prices=np.ndarray(in_shape, dtype=np.float64, buffer=shm_in.buf),
+        features=np.ndarray(out_shape, dtype=np.float64, buffer=shm_out.buf),
+        columns=columns,
+        names=names,
+    )
+
+
+def _compute_shard(bounds: list[tuple[int, int]]) -> int:
+    """Compute every ticker [start, end) of a shard from shared prices into shared features."""
+    prices, out = _worker["prices"], _worker["features"]
+    rows = 0
+    for start, end in bounds:
+        values = {col: prices[j, start:end] for j, col in enumerate(_worker["columns"])}
+        values = evaluate(values, _worker["names"])
+        for k, name in enumerate(_worker["names"]):
+            out[k, start:end] = values[name]
+        rows += end - start
+    return rows
+
+
+def _shared_block(shape: tuple, fill: np.ndarray | float) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    arr = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    arr[...] = fill
+    return shm, arr
+
+
+def ticker_bounds(df: pd.DataFrame) -> list[tuple[int, int]]:
+    """[start, end) row ranges of each ticker in a frame sorted by (ticker, date)."""
+    keys = df["ticker"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def compute_parallel(df: pd.DataFrame, names: list[str] | None = None,
+                     workers: int = POOL_WORKERS, shard_size: int = SHARD_TICKERS) -> pd.DataFrame:
+    """
+    Registry features for a long (ticker, date, prices) frame, sharded by
+    ticker across a process pool. Prices are copied once into a shared
+    memory block (one contiguous row per column) and workers write their
+    results into a second shared block, so nothing but row ranges is
+    pickled. workers=1 runs in-process.
+    """
+    names = names or stored_features()
+    df = df.sort_values(["ticker", "date"], kind="mergesort").reset_index(drop=True)
+    columns = [c for c in PRICE_INPUTS if c in df.columns]
+    n = len(df)
+
+    shm_in, prices = _shared_block((len(columns), n), 0.0)
+    shm_out, features = _shared_block((len(names), n), np.nan)
+    try:
+        for j, col in enumerate(columns):
+            prices[j] = df[col].to_numpy(dtype=np.float64)
+
+        bounds = ticker_bounds(df)
+        shards = [bounds[i:i + shard_size] for i in range(0, len(bounds), shard_size)]
+        initargs = (shm_in.name, prices.shape, shm_out.name, features.shape, columns, names)
+
+        if workers <= 1:
+            _attach(*initargs)
+            for shard in shards:
+                _compute_shard(shard)
+            _worker.clear()
+        else:
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(POOL_CONTEXT),
+                                     initializer=_attach, initargs=initargs) as pool:
+                for _ in pool.map(_compute_shard, shards):
+                    pass
+
+        result = pd.DataFrame(features.T.copy(), columns=names)
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+
+    return pd.concat([df, result], axis=1)
+
+
+def run(mode: str | None = None, tickers: list[str] | None = None, packs: list[str] | None = None,
+        workers: int = POOL_WORKERS, shard_size: int = SHARD_TICKERS) -> int:
+    """Load the price panel, compute it across `workers` processes and write it with one COPY."""
+    from database.connection import get_session
+    from database.crud import get_price_panel
+    from database.bulk_loader import copy_features
+    from ingestion.feature_engineer import MODE, FULL_ROWS, LOOKBACK_ROWS
+    from ingestion.feature_panel import new_rows, select_new
+    from ingestion.feature_pack import attach_benchmark, write_pack
+    from ingestion.feature_registry import pack_features
+    from ml.feature_store import notify_written
+
+    mode = mode or MODE
+    if mode not in ("incremental", "full"):
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'full'")
+    extra = pack_features(packs or [])
+
+    with get_session() as session:
+        t0 = time.perf_counter()
+        prices = get_price_panel(session, tickers, FULL_ROWS, LOOKBACK_ROWS,
+                                 incremental=mode == "incremental")
+        if prices.empty:
+            print("Features up to date for all tickers.")
+            return 0
+        if extra:
+            prices = attach_benchmark(prices)
+        t1 = time.perf_counter()
+
+        computed = compute_parallel(prices, stored_features() + extra, workers, shard_size)
+        t2 = time.perf_counter()
+
+        frame = select_new(computed)
+        written = copy_features(session, frame) if not frame.empty else 0
+        if written:
+            notify_written(frame["ticker"].unique().tolist())
+        if extra:
+            print(f"Inserted {write_pack(session, new_rows(computed), extra)} {', '.join(packs)} pack values")
+        t3 = time.perf_counter()
+
+    print(f"Pool features ({workers} workers): {prices['ticker'].nunique()} tickers, "
+          f"{written} feature rows written "
+          f"(load {t1 - t0:.2f}s, compute {t2 - t1:.2f}s, write {t3 - t2:.2f}s)")
+    return written
+
+
+def benchmark(n_tickers: int = 1000, n_days: int = 500, max_workers: int = POOL_WORKERS,
+              shard_size: int = SHARD_TICKERS) -> list[dict]:
+    """Compute time at 1, 2, 4, ... max_workers processes on synthetic prices (parity: tests/test_feature_pool.py)."""
+    from ingestion.feature_panel import _synthetic_prices
+
+    df = _synthetic_prices(n_tickers, n_days)
+    names = stored_features()
+    counts = sorted({w for w in (1, 2, 4, 8, 16, 32, 64) if w <= max_workers} | {max_workers})
+
+    compute_parallel(df.head(n_days), names, workers=1)     # numba compile outside the timings
+    results = []
+    for w in counts:
+        t0 = time.perf_counter()
+        compute_parallel(df, names, workers=w, shard_size=shard_size)
+        seconds = time.perf_counter() - t0
+        results.append({
+            "workers": w,
+            "seconds": seconds,
+            "speedup": results[0]["seconds"] / seconds if results else 1.0,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute features across a process pool")
+    parser.add_argument("mode", nargs="?", default=None, choices=["incremental", "full"])
+    parser.add_argument("--workers", type=int, default=POOL_WORKERS)
+    parser.add_argument("--shard-size", type=int, default=SHARD_TICKERS)
+    parser.add_argument("--pack", action="append", dest="packs", help="opt-in feature pack, e.g. risk")
+    parser.add_argument("--benchmark", action="store_true", help="scaling benchmark from 1 to --workers processes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for row in benchmark(max_workers=args.workers, shard_size=args.shard_size):
+            print(row)
+    else:
+        run(args.mode, packs=args.packs, workers=args.workers, shard_size=args.shard_size)
@@ -0,0 +1,167 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+from ingestion import indicators, feature_pack
+from ingestion.rolling_kernel import rolling_moments, shift
+
+# Raw price columns a feature can take as input. benchmark_close is the
+# benchmark index close aligned on date (feature_pack.attach_benchmark).
+PRICE_INPUTS = ["open", "high", "low", "close", "volume", "benchmark_close"]
+
+# name -> {"inputs": [...], "lookback": rows of history the feature itself
+# needs beyond its inputs, "fn": fn(*input arrays), "stored": persisted at
+# all, "pack": None for a features column, else the opt-in pack stored in
+# feature_values}. Names starting with "_" are shared intermediates.
+REGISTRY = {}
+
+
+def register(name: str, inputs: list[str], lookback: int = 0, stored: bool = True,
+             pack: str | None = None):
+    def decorator(fn):
+        REGISTRY[name] = {"inputs": inputs, "lookback": lookback, "fn": fn,
+                          "stored": stored, "pack": pack}
+        return fn
+    return decorator
+
+
+@register("log_return", ["close"], lookback=1)
+def _log_return(close):
+    return np.log(close / shift(close, 1))
+
+for _k in (1, 5, 21, 63):
+    register(f"lag_{_k}d", ["log_return"], lookback=_k)(lambda r, k=_k: shift(r, k))
+
+@register("_return_moments_21", ["log_return"], lookback=20, stored=False)
+def _return_moments_21(log_return):
+    return rolling_moments(log_return, 21, skew=True)
+
+register("rolling_mean_21", ["_return_moments_21"])(lambda m: m["mean"])
+register("rolling_std_21", ["_return_moments_21"])(lambda m: m["std"])
+register("rolling_skew_21", ["_return_moments_21"])(lambda m: m["skew"])
+
+# Wilder smoothing has unbounded memory; 250 rows leaves ~1e-8 of the seed
+@register("rsi_14", ["close"], lookback=250)
+def _rsi_14(close):
+    return indicators.rsi(close, 14)
+
+@register("_close_bands_20", ["close"], lookback=19, stored=False)
+def _close_bands_20(close):
+    return rolling_moments(close, 20)
+
+@register("bb_pct_b", ["close", "_close_bands_20"])
+def _bb_pct_b(close, bands, num_std: float = 2.0):
+    upper = bands["mean"] + num_std * bands["std"]
+    lower = bands["mean"] - num_std * bands["std"]
+    return (close - lower) / (upper - lower)
+
+@register("volume_ratio", ["volume"], lookback=20)
+def _volume_ratio(volume, window: int = 20):
+    return volume / shift(rolling_moments(volume, window)["mean"], 1)
+
+# --- risk pack (opt-in, stored in feature_values) ---------------------------
+
+register("parkinson_vol_21", ["high", "low"], lookback=20, pack="risk")(feature_pack.parkinson_vol)
+register("garman_klass_vol_21", ["open", "high", "low", "close"], lookback=20, pack="risk")(
+    feature_pack.garman_klass_vol)
+register("atr_14", ["high", "low", "close"], lookback=250, pack="risk")(indicators.atr)
+register("downside_semivar_21", ["log_return"], lookback=20, pack="risk")(feature_pack.downside_semivariance)
+register("_benchmark_return", ["benchmark_close"], stored=False)(_log_return)
+register("beta_63", ["log_return", "_benchmark_return"], lookback=62, pack="risk")(feature_pack.rolling_beta)
+register("max_drawdown_63", ["close"], lookback=62, pack="risk")(indicators.max_drawdown)
+register("autocorr_21", ["log_return"], lookback=21, pack="risk")(feature_pack.rolling_autocorr)
+
+
+def stored_features() -> list[str]:
+    """Columns of the features table, in registration order."""
+    return [name for name, spec in REGISTRY.items() if spec["stored"] and spec["pack"] is None]
+
+
+def pack_features(packs: list[str]) -> list[str]:
+    """Features of the given opt-in packs, in registration order."""
+    unknown = set(packs) - {spec["pack"] for spec in REGISTRY.values()}
+    if unknown:
+        raise ValueError(f"Unknown feature packs: {sorted(unknown)}")
+    return [name for name, spec in REGISTRY.items() if spec["stored"] and spec["pack"] in packs]
+
+
+def select(*names: str) -> list[str]:
+    """Validate a consumer's feature list against the registry and return it."""
+    unknown = [n for n in names if n not in REGISTRY or not REGISTRY[n]["stored"] or REGISTRY[n]["pack"]]
+    if unknown:
+        raise ValueError(f"Unknown features: {unknown}")
+    return list(names)
+
+
+def dependencies(names: list[str]) -> list[str]:
+    """Every registered feature needed for `names`, inputs before their dependants."""
+    order, seen = [], set()
+
+    def visit(name: str, path: tuple) -> None:
+        if name in PRICE_INPUTS or name in seen:
+            return
+        if name not in REGISTRY:
+            raise ValueError(f"Unknown feature '{name}'")
+        if name in path:
+            raise ValueError(f"Feature dependency cycle: {' -> '.join(path + (name,))}")
+        for dep in REGISTRY[name]["inputs"]:
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in names:
+        visit(name, ())
+    return order
+
+
+def lookback(names: list[str]) -> int:
+    """Rows of price history needed before the first row for which `names` are all defined."""
+    memo = {}
+
+    def rows(name: str) -> int:
+        if name in PRICE_INPUTS:
+            return 0
+        if name not in memo:
+            spec = REGISTRY[name]
+            memo[name] = spec["lookback"] + max((rows(dep) for dep in spec["inputs"]), default=0)
+        return memo[name]
+
+    dependencies(names)
+    return max((rows(n) for n in names), default=0)
+
+
+def evaluate(values: dict, names: list[str]) -> dict:
+    """
+    Evaluate `names` over input arrays ({price column: array}, 1-D or
+    (tickers, obs) grids). Only the dependency subgraph is evaluated and
+    each intermediate once, so asking for rsi_14 alone never computes the
+    rolling moments, and the lags share one log_return. Returns `values`
+    extended with every evaluated node.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for name in dependencies(names):
+            if name in values:
+                continue
+            spec = REGISTRY[name]
+            missing = [dep for dep in spec["inputs"] if dep not in values]
+            if missing:
+                raise ValueError(f"'{name}' needs missing columns {missing}")
+            values[name] = spec["fn"](*(values[dep] for dep in spec["inputs"]))
+    return values
+
+
+def compute(df: pd.DataFrame, names: list[str] | None = None) -> pd.DataFrame:
+    """Add the requested features (default: all stored) to a single-ticker price frame."""
+    if df is None or df.empty:
+        raise ValueError("DataFrame is empty or None")
+    names = names or stored_features()
+
+    df = df.sort_values("date").reset_index(drop=True)
+    values = {col: df[col].to_numpy(dtype=float) for col in PRICE_INPUTS if col in df.columns}
+    values = evaluate(values, names)
+
+    for name in names:
+        df[name] = values[name]
+    return df
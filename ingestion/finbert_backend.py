@@ -0,0 +1,203 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import time
+from config.settings import DATA_DIR, FINBERT_BACKEND
+
+MODEL_ID      = "ProsusAI/finbert"
+BACKENDS      = ("pytorch", "quantized", "onnx")
+ONNX_DIR      = DATA_DIR / "onnx" / "finbert"
+# int8 state dict + config + tokenizer; see build_quantized()
+QUANTIZED_DIR = DATA_DIR / "quantized" / "finbert"
+
+
+def _load_pytorch(model_id: str):
+    from transformers import pipeline
+    return pipeline("text-classification", model=model_id)
+
+
+def build_quantized(model_id: str = MODEL_ID) -> Path:
+    """
+    Quantize every nn.Linear of the full-precision model to int8 and save
+    it to QUANTIZED_DIR with the config and tokenizer. Linear layers are
+    stored as int8 values + scale / zero point and everything else as
+    plain tensors, so the file loads with torch.load(weights_only=True).
+    Peaks at the fp32 footprint, so it runs once, in its own process.
+    """
+    import torch
+    from torch.ao.nn.quantized.dynamic import Linear as QuantizedLinear
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_id)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    linear = {}
+    for name, module in model.named_modules():
+        if isinstance(module, QuantizedLinear):
+            weight, bias = module._weight_bias()
+            linear[name] = {"weight": weight.int_repr(), "scale": weight.q_scale(),
+                            "zero_point": weight.q_zero_point(), "bias": bias}
+    # named_buffers() also covers the non-persistent ones state_dict() leaves out
+    tensors = {name: t.detach() for name, t in [*model.named_parameters(), *model.named_buffers()]}
+
+    QUANTIZED_DIR.mkdir(parents=True, exist_ok=True)
+    torch.save({"tensors": tensors, "linear": linear}, QUANTIZED_DIR / "model_int8.pt")
+    model.config.save_pretrained(QUANTIZED_DIR)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(QUANTIZED_DIR)
+    return QUANTIZED_DIR
+
+
+def _build_in_subprocess(builder, model_id: str) -> None:
+    """Run a one-off export in a spawned process so its fp32 peak never lands in this one."""
+    import multiprocessing as mp
+
+    proc = mp.get_context("spawn").Process(target=builder, args=(model_id,))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        raise RuntimeError(f"{builder.__name__} failed with exit code {proc.exitcode}")
+
+
+def _load_quantized(model_id: str):
+    """
+    Int8 model rebuilt from the tensors build_quantized saved. The skeleton is created
+    on the meta device and its nn.Linear layers are swapped for int8 ones
+    before loading, so fp32 weights are never materialized at runtime.
+    """
+    import torch
+    from torch.ao.nn.quantized.dynamic import Linear as QuantizedLinear
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    if not (QUANTIZED_DIR / "model_int8.pt").exists():
+        _build_in_subprocess(build_quantized, model_id)
+
+    config = AutoConfig.from_pretrained(QUANTIZED_DIR)
+    with torch.device("meta"):
+        model = AutoModelForSequenceClassification.from_config(config)
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if isinstance(child, torch.nn.Linear):
+                setattr(module, name, QuantizedLinear(child.in_features, child.out_features,
+                                                      bias_=child.bias is not None, dtype=torch.qint8))
+
+    saved = torch.load(QUANTIZED_DIR / "model_int8.pt", weights_only=True)
+    for name, tensor in saved["tensors"].items():
+        owner, _, attr = name.rpartition(".")
+        module = model.get_submodule(owner)
+        if attr in module._parameters:
+            module._parameters[attr] = torch.nn.Parameter(tensor, requires_grad=False)
+        else:
+            module._buffers[attr] = tensor
+    for name, q in saved["linear"].items():
+        weight = torch._make_per_tensor_quantized_tensor(q["weight"], q["scale"], q["zero_point"])
+        model.get_submodule(name).set_weight_bias(weight, q["bias"])
+    if any(t.is_meta for t in [*model.parameters(), *model.buffers()]):
+        raise RuntimeError(f"Quantized FinBERT in {QUANTIZED_DIR} is incomplete; delete it to rebuild")
+
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(QUANTIZED_DIR)
+    return pipeline("text-classification", model=model, tokenizer=tokenizer)
+
+
+def export_onnx(model_id: str = MODEL_ID) -> Path:
+    """Export the model to ONNX_DIR. Loads the fp32 PyTorch model, so it runs in its own process."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+    ONNX_DIR.mkdir(parents=True, exist_ok=True)
+    model.save_pretrained(ONNX_DIR)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(ONNX_DIR)
+    return ONNX_DIR
+
+
+def _load_onnx(model_id: str):
+    """ONNX Runtime on CPU. The export is done once and reused from ONNX_DIR."""
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise RuntimeError(
+            "FINBERT_BACKEND=onnx requires optimum[onnxruntime] "
+            "(pip install 'optimum[onnxruntime]')"
+        ) from e
+    from transformers import AutoTokenizer, pipeline
+
+    if not (ONNX_DIR / "model.onnx").exists():
+        _build_in_subprocess(export_onnx, model_id)
+    model = ORTModelForSequenceClassification.from_pretrained(ONNX_DIR)
+    tokenizer = AutoTokenizer.from_pretrained(ONNX_DIR)
+    return pipeline("text-classification", model=model, tokenizer=tokenizer)
+
+
+_LOADERS = {
+    "pytorch":   _load_pytorch,
+    "quantized": _load_quantized,
+    "onnx":      _load_onnx,
+}
+
+
+def load_pipeline(backend: str | None = None, model_id: str = MODEL_ID):
+    """
+    Return a text-classification callable for the configured backend. Every
+    backend yields the same [{"label", "score"}] output, so score_sentiment /
+    score_sentiments work unchanged on top of it.
+    """
+    backend = (backend or FINBERT_BACKEND).lower()
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown FINBERT_BACKEND '{backend}', expected one of {BACKENDS}")
+    return _LOADERS[backend](model_id)
+
+
+def cache_model_id(backend: str | None = None, model_id: str = MODEL_ID) -> str:
+    """Sentiment-cache namespace: quantized/ONNX scores differ slightly from the reference."""
+    backend = (backend or FINBERT_BACKEND).lower()
+    return model_id if backend == "pytorch" else f"{model_id}:{backend}"
+
+
+def _measure(backend: str, headlines: list[str], out) -> None:
+    import resource
+    from ingestion.news_fetcher import score_sentiments
+
+    t0 = time.perf_counter()
+    pipe = load_pipeline(backend)
+    load_s = time.perf_counter() - t0
+
+    score_sentiments(pipe, headlines[:8])   # warm-up
+    t0 = time.perf_counter()
+    score_sentiments(pipe, headlines)
+    score_s = time.perf_counter() - t0
+
+    out.put({
+        "backend":       backend,
+        "load_s":        load_s,
+        "headlines_s":   len(headlines) / score_s,
+        "peak_rss_mb":   resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def benchmark(backends: tuple = BACKENDS, n_headlines: int = 256) -> list[dict]:
+    """Load time, throughput and peak RSS per backend, each in a fresh process."""
+    import multiprocessing as mp
+    from ingestion.news_fetcher import SAMPLE_HEADLINES
+
+    headlines = (SAMPLE_HEADLINES * (n_headlines // len(SAMPLE_HEADLINES) + 1))[:n_headlines]
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in backends:
+        out = ctx.Queue()
+        proc = ctx.Process(target=_measure, args=(backend, headlines, out))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            results.append({"backend": backend, "error": f"exit code {proc.exitcode}"})
+            continue
+        results.append(out.get())
+    return results
+
+
+if __name__ == "__main__":
+    # parity with the full-precision model: tests/test_finbert_backend.py
+    for row in benchmark():
+        print(row)
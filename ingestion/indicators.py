@@ -0,0 +1,272 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# All indicators take float64 arrays shaped (n_series, n_obs) -- one row per
+# ticker, oldest observation first, NaN for missing -- or a single 1-D
+# series, and return arrays of the same shape. Results match the pandas
+# formulas (ewm(adjust=False), rolling with min_periods=window); the golden
+# comparison is tests/test_indicators.py.
+
+
+def _as_2d(*arrays):
+    ndim = np.ndim(arrays[0])
+    out = tuple(np.atleast_2d(np.asarray(a, dtype=np.float64)) for a in arrays)
+    return ndim, out
+
+
+def _restore(ndim: int, arr: np.ndarray) -> np.ndarray:
+    return arr[0] if ndim == 1 else arr
+
+
+def _ewm_numpy(x: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas ewm(alpha, adjust=False).mean() along axis 1, stepping over time for all rows at once."""
+    out = np.empty_like(x)
+    weighted = x[:, 0].copy()
+    old_wt = np.ones(x.shape[0])
+    out[:, 0] = weighted
+    for t in range(1, x.shape[1]):
+        cur = x[:, t]
+        is_obs = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        upd = started & is_obs
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(upd & (weighted != cur), blended, weighted)
+        old_wt = np.where(upd, 1.0, old_wt)
+        weighted = np.where(~started & is_obs, cur, weighted)
+        out[:, t] = weighted
+    return out
+
+
+def _rolling_mean_numpy(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if x.shape[1] >= window:
+        nans = np.isnan(x)
+        zero = np.zeros((x.shape[0], 1))
+        total = np.concatenate([zero, np.cumsum(np.where(nans, 0.0, x), axis=1)], axis=1)
+        count = np.concatenate([zero, np.cumsum(nans, axis=1)], axis=1)
+        means = (total[:, window:] - total[:, :-window]) / window
+        out[:, window - 1:] = np.where(count[:, window:] - count[:, :-window] > 0, np.nan, means)
+    return out
+
+
+def _rolling_numpy(x: np.ndarray, window: int, how: str) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if x.shape[1] >= window:
+        view = np.lib.stride_tricks.sliding_window_view(x, window, axis=1)
+        out[:, window - 1:] = getattr(view, how)(axis=-1)     # NaN anywhere in the window -> NaN
+    return out
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _ewm_numba(x, alpha):
+        n, m = x.shape
+        out = np.empty_like(x)
+        for i in range(n):
+            weighted = x[i, 0]
+            old_wt = 1.0
+            out[i, 0] = weighted
+            for t in range(1, m):
+                cur = x[i, t]
+                if weighted == weighted:
+                    old_wt *= 1 - alpha
+                    if cur == cur:
+                        if weighted != cur:
+                            weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                        old_wt = 1.0
+                elif cur == cur:
+                    weighted = cur
+                out[i, t] = weighted
+        return out
+
+    @njit(cache=True)
+    def _rolling_mean_numba(x, window):
+        # running sum and NaN count: O(n) whatever the window
+        n, m = x.shape
+        out = np.full_like(x, np.nan)
+        for i in range(n):
+            total = 0.0
+            nans = 0
+            for t in range(m):
+                v = x[i, t]
+                if v != v:
+                    nans += 1
+                else:
+                    total += v
+                if t >= window:
+                    old = x[i, t - window]
+                    if old != old:
+                        nans -= 1
+                    else:
+                        total -= old
+                if t >= window - 1 and nans == 0:
+                    out[i, t] = total / window
+        return out
+
+    @njit(cache=True)
+    def _rolling_numba(x, window, how):
+        # how: 1 = min, 2 = max
+        n, m = x.shape
+        out = np.full_like(x, np.nan)
+        for i in range(n):
+            for t in range(window - 1, m):
+                acc = x[i, t]
+                ok = acc == acc
+                for j in range(t - window + 1, t):
+                    v = x[i, j]
+                    if v != v:
+                        ok = False
+                        break
+                    if how == 0:
+                        acc += v
+                    elif how == 1:
+                        acc = min(acc, v)
+                    else:
+                        acc = max(acc, v)
+                if ok:
+                    out[i, t] = acc / window if how == 0 else acc
+        return out
+
+    @njit(cache=True)
+    def _drawdown_numba(x, window):
+        n, m = x.shape
+        out = np.full_like(x, np.nan)
+        for i in range(n):
+            for t in range(window - 1, m):
+                peak = x[i, t - window + 1]
+                worst = 0.0
+                for j in range(t - window + 1, t + 1):
+                    v = x[i, j]
+                    if v != v:
+                        worst = np.nan
+                        break
+                    if v > peak:
+                        peak = v
+                    dd = v / peak - 1
+                    if dd < worst:
+                        worst = dd
+                out[i, t] = worst
+        return out
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    return _ewm_numba(x, alpha) if HAS_NUMBA else _ewm_numpy(x, alpha)
+
+
+def _rolling(x: np.ndarray, window: int, how: str) -> np.ndarray:
+    if how == "mean":
+        return _rolling_mean_numba(x, window) if HAS_NUMBA else _rolling_mean_numpy(x, window)
+    if HAS_NUMBA:
+        return _rolling_numba(x, window, {"min": 1, "max": 2}[how])
+    return _rolling_numpy(x, window, how)
+
+
+def rolling(x, window: int, how: str = "mean") -> np.ndarray:
+    """Rolling mean / min / max over the last axis; NaN anywhere in the window gives NaN."""
+    ndim, (x,) = _as_2d(x)
+    return _restore(ndim, _rolling(x, window, how))
+
+
+def max_drawdown(close, window: int = 63) -> np.ndarray:
+    """Worst peak-to-trough decline (<= 0) within each trailing `window`, as a fraction."""
+    ndim, (close,) = _as_2d(close)
+    if HAS_NUMBA:
+        return _restore(ndim, _drawdown_numba(close, window))
+    out = np.full_like(close, np.nan)
+    if close.shape[1] >= window:
+        view = np.lib.stride_tricks.sliding_window_view(close, window, axis=1)
+        out[:, window - 1:] = (view / np.maximum.accumulate(view, axis=-1) - 1).min(axis=-1)
+    return _restore(ndim, out)
+
+
+def _prev(x: np.ndarray) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+def ewm(x, alpha: float | None = None, span: float | None = None) -> np.ndarray:
+    """Exponentially weighted mean, pandas ewm(adjust=False) semantics."""
+    if alpha is None:
+        alpha = 2 / (span + 1)
+    ndim, (x,) = _as_2d(x)
+    return _restore(ndim, _ewm(x, alpha))
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """Wilder RSI: EWM (alpha = 1/window) of gains over EWM of losses."""
+    ndim, (close,) = _as_2d(close)
+    delta = close - _prev(close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+        loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+        rs = _ewm(gain, 1 / window) / _ewm(loss, 1 / window)
+        return _restore(ndim, 100 - (100 / (1 + rs)))
+
+
+def true_range(high, low, close) -> np.ndarray:
+    ndim, (high, low, close) = _as_2d(high, low, close)
+    prev_close = _prev(close)
+    tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    return _restore(ndim, tr)
+
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    """Average true range with Wilder smoothing."""
+    ndim, (high, low, close) = _as_2d(high, low, close)
+    return _restore(ndim, _ewm(true_range(high, low, close), 1 / window))
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> dict[str, np.ndarray]:
+    ndim, (close,) = _as_2d(close)
+    line = _ewm(close, 2 / (fast + 1)) - _ewm(close, 2 / (slow + 1))
+    sig = _ewm(line, 2 / (signal + 1))
+    return {"macd": _restore(ndim, line), "signal": _restore(ndim, sig), "hist": _restore(ndim, line - sig)}
+
+
+def stochastic(high, low, close, k: int = 14, d: int = 3) -> dict[str, np.ndarray]:
+    """%K over `k` periods and its `d`-period simple average %D."""
+    ndim, (high, low, close) = _as_2d(high, low, close)
+    lowest = _rolling(low, k, "min")
+    highest = _rolling(high, k, "max")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_k = 100 * (close - lowest) / (highest - lowest)
+    return {"k": _restore(ndim, pct_k), "d": _restore(ndim, _rolling(pct_k, d, "mean"))}
+
+
+def benchmark(n_tickers: int = 1000, n_obs: int = 500) -> dict:
+    """One 2-D RSI call vs the per-ticker pandas RSI."""
+    import time
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_tickers, n_obs)), axis=1))
+    rsi(close[:2])                                    # numba compile
+
+    t0 = time.perf_counter()
+    for row in close:
+        delta = pd.Series(row).diff()
+        g = delta.clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
+        l = (-delta).clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
+        _ = 100 - (100 / (1 + g / l))
+    pandas_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rsi(close)
+    kernel_s = time.perf_counter() - t0
+    return {"numba": HAS_NUMBA, "tickers": n_tickers, "pandas_s": pandas_s,
+            "kernel_s": kernel_s, "speedup": pandas_s / kernel_s}
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE    = 2.0      # requests per second
+DEFAULT_BURST   = 4
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `acquire()` blocks until a token is available."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate     = rate
+        self.capacity = max(1, burst)
+        self._tokens  = float(self.capacity)
+        self._last    = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def _timed_fetch(fetch_fn: Callable[[str], Any], symbol: str, limiter: TokenBucket | None) -> dict:
+    t0 = time.perf_counter()
+    waited = limiter.acquire() if limiter else 0.0
+    try:
+        data, error = fetch_fn(symbol), None
+    except Exception as e:
+        data, error = None, e
+    return {
+        "symbol":  symbol,
+        "data":    data,
+        "error":   error,
+        "waited":  waited,
+        "latency": time.perf_counter() - t0,
+    }
+
+
+def run_concurrent(
+    symbols: Iterable[str],
+    fetch_fn: Callable[[str], Any],
+    write_fn: Callable[[str, Any], Any],
+    workers: int = DEFAULT_WORKERS,
+    rate: float | None = DEFAULT_RATE,
+    burst: int = DEFAULT_BURST,
+) -> list[dict]:
+    """
+    Fetch `symbols` concurrently and hand each result to `write_fn` on the
+    calling thread, so the DB session is only ever touched by one writer.
+
+    `fetch_fn(symbol)` runs in a pool of `workers` threads, throttled by a
+    token bucket of `rate` requests/second (None disables throttling).
+    Returns one stats dict per symbol in completion order.
+    """
+    symbols = list(symbols)
+    limiter = TokenBucket(rate, burst) if rate else None
+    stats   = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(_timed_fetch, fetch_fn, s, limiter) for s in symbols]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            symbol = result["symbol"]
+            written = None
+
+            if result["error"] is None:
+                try:
+                    written = write_fn(symbol, result.pop("data"))
+                except Exception as e:
+                    result["error"] = e
+            else:
+                result.pop("data")
+
+            result["written"] = written
+            stats.append(result)
+
+            status = "ok" if result["error"] is None else f"error: {result['error']}"
+            print(
+                f"[{symbol}] {done}/{len(symbols)} fetched in {result['latency']:.2f}s "
+                f"(throttled {result['waited']:.2f}s) — {status}"
+            )
+
+    return stats
+
+
+def summarize(stats: list[dict]) -> dict:
+    latencies = sorted(s["latency"] for s in stats)
+    if not latencies:
+        return {"symbols": 0, "failed": 0}
+    return {
+        "symbols":     len(stats),
+        "failed":      sum(1 for s in stats if s["error"] is not None),
+        "latency_p50": latencies[len(latencies) // 2],
+        "latency_max": latencies[-1],
+    }
@@ -4,6 +4,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 GREEN  = "\033[92m"
 RED    = "\033[91m"
@@ -26,6 +27,9 @@ def failure(msg: str) -> None:
 def info(msg: str) -> None:
     print(f"{YELLOW}  ➤  {msg}{RESET}")
 
+def skipped(msg: str) -> None:
+    print(f"{YELLOW}  ⤼  {msg}{RESET}")
+
 
 def run_price_fetcher() -> bool:
     from ingestion.price_fetcher import run
@@ -61,12 +65,12 @@ STAGES = [
     {
         "name":        "Stock Prices     (yfinance)",
         "fn":          run_price_fetcher,
-        "description": "Fetching 10y daily OHLCV for AAPL, MSFT, GOOGL …",
+        "description": "Fetching daily OHLCV since last stored date (10y backfill if empty) …",
     },
     {
         "name":        "Crypto Prices    (CCXT / Binance)",
         "fn":          run_crypto_fetcher,
-        "description": "Fetching 365d daily OHLCV for BTC, ETH, BNB, SOL, ADA …",
+        "description": "Fetching daily OHLCV since last stored date for BTC, ETH, BNB, SOL, ADA …",
     },
     {
         "name":        "Macro Indicators (FRED)",
@@ -82,59 +86,151 @@ STAGES = [
         "name":        "Feature Engineering",
         "fn":          run_feature_engineer,
         "description": "Computing log-returns, RSI, Bollinger Bands, rolling stats …",
-        "depends_on":  "Stock Prices",  
+        "depends_on":  ["Stock Prices"],
     },
 ]
 
-def run_pipeline(stages: list[dict] | None = None) -> None:
+MAX_WORKERS = 4
+
+def resolve_dependencies(stages: list[dict]) -> dict[str, set[str]]:
+    """
+    Map each stage name to the names of the stages it depends on.
+    `depends_on` entries may be a full stage name or a prefix of one
+    (e.g. "Stock Prices"); dependencies outside `stages` are ignored.
+    """
+    names = [stage["name"] for stage in stages]
+    graph = {}
+    for stage in stages:
+        deps = stage.get("depends_on") or []
+        if isinstance(deps, str):
+            deps = [deps]
+        resolved = set()
+        for dep in deps:
+            matches = [n for n in names if n == dep or n.startswith(dep)]
+            if not matches:
+                info(f"{stage['name'].strip()}: dependency '{dep}' not in this run, ignoring")
+            resolved.update(matches)
+        resolved.discard(stage["name"])
+        graph[stage["name"]] = resolved
+
+    # reject cycles up front rather than deadlocking the scheduler
+    visiting, done = set(), set()
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle involving stage '{name}'")
+        visiting.add(name)
+        for dep in graph[name]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+    for name in graph:
+        visit(name)
+
+    return graph
+
+
+def _run_stage(stage: dict, idx: int, total: int) -> tuple[bool, float, Exception | None]:
+    header(f"[{idx}/{total}]  {stage['name']}")
+    info(stage.get("description", ""))
+
+    t0 = time.time()
+    try:
+        stage["fn"]()
+        return True, time.time() - t0, None
+    except Exception as exc:
+        traceback.print_exc()
+        return False, time.time() - t0, exc
+
+
+def run_pipeline(stages: list[dict] | None = None, max_workers: int = MAX_WORKERS) -> dict:
+    """
+    Run stages as a dependency graph: every stage whose dependencies have
+    passed is started immediately on a thread pool, and a stage is skipped
+    only if one of its own (transitive) dependencies failed.
+    """
     stages = stages or STAGES
+    graph  = resolve_dependencies(stages)
+    by_name = {stage["name"]: stage for stage in stages}
+    index   = {stage["name"]: idx for idx, stage in enumerate(stages, start=1)}
 
     total   = len(stages)
-    results = {}         
+    results = {}            # name -> True (pass) / False (fail) / None (skipped)
+    timings = {}
     t_start = time.time()
 
     print(f"\n{BOLD}{'═' * 60}{RESET}")
-    print(f"{BOLD}  INGESTION PIPELINE  —  {total} stage(s) queued{RESET}")
+    print(f"{BOLD}  INGESTION PIPELINE  —  {total} stage(s) queued, {max_workers} worker(s){RESET}")
     print(f"{BOLD}{'═' * 60}{RESET}")
 
-    for idx, stage in enumerate(stages, start=1):
-        name  = stage["name"]
-        fn    = stage["fn"]
-        desc  = stage.get("description", "")
-
-        header(f"[{idx}/{total}]  {name}")
-        info(desc)
-
-        t0 = time.time()
-        try:
-            fn()
-            elapsed = time.time() - t0
-            success(f"Completed in {elapsed:.1f}s")
-            results[name] = True
-
-        except Exception as exc:
-            elapsed = time.time() - t0
-            failure(f"Failed after {elapsed:.1f}s — {exc}")
-            traceback.print_exc()
-            results[name] = False
+    def skip_blocked() -> None:
+        changed = True
+        while changed:
+            changed = False
+            for name, deps in graph.items():
+                if name in results:
+                    continue
+                failed = [d for d in deps if d in results and results[d] is not True]
+                if failed:
+                    results[name] = None
+                    skipped(f"Skipping {name.strip()} — dependency failed: {', '.join(f.strip() for f in failed)}")
+                    changed = True
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running = {}
+        while len(results) < total:
+            for name in by_name:
+                if name in results or name in running.values():
+                    continue
+                if all(results.get(d) is True for d in graph[name]):
+                    future = pool.submit(_run_stage, by_name[name], index[name], total)
+                    running[future] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                ok, elapsed, exc = future.result()
+                timings[name] = elapsed
+                results[name] = ok
+                if ok:
+                    success(f"{name.strip()} completed in {elapsed:.1f}s")
+                else:
+                    failure(f"{name.strip()} failed after {elapsed:.1f}s — {exc}")
+            skip_blocked()
 
     total_elapsed = time.time() - t_start
-    passed = sum(v for v in results.values())
-    failed = total - passed
+    passed = sum(1 for v in results.values() if v is True)
+    failed = sum(1 for v in results.values() if v is False)
+    skipped_count = sum(1 for v in results.values() if v is None)
 
     print(f"\n{BOLD}{'═' * 60}{RESET}")
-    print(f"{BOLD}  PIPELINE SUMMARY  —  finished in {total_elapsed:.1f}s{RESET}")
+    print(f"{BOLD}  PIPELINE SUMMARY  —  finished in {total_elapsed:.1f}s "
+          f"(sum of stages {sum(timings.values()):.1f}s){RESET}")
     print(f"{BOLD}{'═' * 60}{RESET}")
 
-    for name, ok in results.items():
-        status = f"{GREEN}PASS{RESET}" if ok else f"{RED}FAIL{RESET}"
-        print(f"  [{status}]  {name}")
+    for stage in stages:
+        name = stage["name"]
+        ok = results.get(name)
+        if ok is True:
+            status = f"{GREEN}PASS{RESET}"
+        elif ok is False:
+            status = f"{RED}FAIL{RESET}"
+        else:
+            status = f"{YELLOW}SKIP{RESET}"
+        elapsed = f"{timings[name]:6.1f}s" if name in timings else "      -"
+        print(f"  [{status}]  {elapsed}  {name}")
 
     print()
-    if failed == 0:
+    if failed == 0 and skipped_count == 0:
         print(f"{GREEN}{BOLD}  All {total} stage(s) completed successfully.{RESET}\n")
     else:
-        print(f"{RED}{BOLD}  {failed}/{total} stage(s) failed. Check logs above.{RESET}\n")
+        print(f"{RED}{BOLD}  {failed}/{total} stage(s) failed, {skipped_count} skipped. Check logs above.{RESET}\n")
+
+    return results
 
 
 
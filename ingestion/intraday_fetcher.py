@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import yfinance as yf
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from database.connection import get_session
+from database.crud import get_intraday_watermarks
+from database.bulk_loader import copy_intraday_bars
+from database.batch_writer import write_batches
+from ingestion.ingestion_engine import run_concurrent, summarize
+from ingestion.price_fetcher import TICKERS, MAX_WORKERS, RATE_LIMIT
+
+# yfinance only serves a limited window of intraday history per interval:
+# "period" is the first load, "history" how far back any request may start
+# and "window" the longest span a single request may cover.
+INTERVALS = {
+    "1m": {"period": "7d",   "step": pd.Timedelta(minutes=1),
+           "history": pd.Timedelta(days=29),  "window": pd.Timedelta(days=7)},
+    "1h": {"period": "730d", "step": pd.Timedelta(hours=1),
+           "history": pd.Timedelta(days=729), "window": pd.Timedelta(days=729)},
+}
+INTERVAL = "1m"
+
+
+def fetch_bars(symbol: str, interval: str = INTERVAL, start: datetime | None = None) -> pd.DataFrame:
+    """
+    Bars from `start` (inclusive) to now. `start` is clamped to the oldest
+    bar yfinance still serves, and the span is paged in `window`-sized
+    requests, so a ticker catches up after an outage instead of getting
+    an empty frame on every run.
+    """
+    spec = INTERVALS[interval]
+    ticker = yf.Ticker(symbol)
+    if start is None:
+        return ticker.history(period=spec["period"], interval=interval)
+
+    now = pd.Timestamp.now(tz="UTC")
+    start = pd.Timestamp(start)
+    start = start.tz_localize("UTC") if start.tz is None else start.tz_convert("UTC")
+    start = max(start, now - spec["history"])
+
+    frames = []
+    while start < now:
+        end = start + spec["window"]
+        page = ticker.history(start=start.to_pydatetime(),
+                              end=end.to_pydatetime() if end < now else None, interval=interval)
+        if not page.empty:
+            frames.append(page)
+        start = end
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames)
+    return df[~df.index.duplicated(keep="last")]
+
+
+def transform(df: pd.DataFrame, symbol: str, interval: str = INTERVAL) -> pd.DataFrame:
+    """Columnar transform to market_bars_intraday: UTC timestamps, float32 prices."""
+    ts = pd.DatetimeIndex(df.index)
+    ts = ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+    out = pd.DataFrame({"ticker": symbol, "interval": interval, "ts": ts}, index=range(len(df)))
+    for src, col in (("Open", "open"), ("High", "high"), ("Low", "low"), ("Close", "close")):
+        if src in df.columns:
+            out[col] = pd.to_numeric(df[src].to_numpy(), errors="coerce").astype("float32")
+    if "Volume" in df.columns:
+        out["volume"] = pd.to_numeric(df["Volume"].to_numpy(), errors="coerce").astype("float64")
+
+    mask = out["close"].notna().to_numpy() if "close" in out.columns else np.zeros(len(out), bool)
+    return out[mask].reset_index(drop=True)
+
+
+def run(interval: str = INTERVAL, tickers: list[str] | None = None, fetch_fn=fetch_bars,
+        workers: int = MAX_WORKERS, rate: float | None = RATE_LIMIT) -> list[dict]:
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval '{interval}', expected one of {list(INTERVALS)}")
+    tickers = tickers or TICKERS
+
+    with get_session() as session:
+        # Re-fetch from the last stored bar, not the one after it: that bar
+        # was usually still open when it was written, and the upsert below
+        # replaces it with its final values.
+        watermarks = get_intraday_watermarks(session, interval)
+        starts = {t: watermarks.get(t) for t in tickers}
+
+        def fetch(symbol: str) -> pd.DataFrame:
+            return fetch_fn(symbol, interval=interval, start=starts[symbol])
+
+        def write(symbol: str, raw_df: pd.DataFrame) -> int:
+            if raw_df is None or raw_df.empty:
+                print(f"[{symbol}] No new {interval} bars, skipping.")
+                return 0
+            frame = transform(raw_df, symbol, interval)
+            stats = write_batches(session, copy_intraday_bars, frame, label=f"{symbol} {interval}")
+            print(f"[{symbol}] Upserted {stats['written']} {interval} bars.")
+            return stats["written"]
+
+        stats = run_concurrent(tickers, fetch, write, workers=workers, rate=rate)
+
+    print(f"Intraday ({interval}) ingestion summary: {summarize(stats)}")
+    return stats
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else INTERVAL)
@@ -2,10 +2,19 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import os
+import pandas as pd
 import requests
+from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from database.connection import get_session
-from database.crud import insert_economic_indicators
+from database.crud import insert_economic_indicators, get_latest_dates
+from database.batch_writer import write_batches, iter_records
+from database.models import EconomicIndicator
 from config.settings import FRED_API_KEY 
+from ingestion.ingestion_engine import run_concurrent, summarize
+from ingestion.data_quality import validate_series, quarantine, report
 
 SERIES = {
     "DFF": "Fed Fund Rate",
@@ -18,9 +27,34 @@ SERIES = {
     "MORTGAGE30US": "30Y Mortgage Rate"
 }
 
-FRED_BASE_URL = 'https://api.stlouisfed.org/fred/series/observations'
+# Overridable so tests can point the fetcher at a local HTTP stub
+FRED_BASE_URL = os.getenv("FRED_BASE_URL", 'https://api.stlouisfed.org/fred/series/observations')
+DEFAULT_START = "2020-01-01"
 
-def fetch_series(series_id: str, observation_start: str = "2020-01-01") -> list[dict]:
+# "incremental" starts each series the day after its last stored observation;
+# "backfill" always starts at DEFAULT_START.
+MODE = "incremental"
+
+MAX_WORKERS = 8
+RATE_LIMIT  = 2.0   # FRED allows 120 requests/minute
+TIMEOUT     = 30
+
+
+def make_http_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """One keep-alive connection pool shared by every series request."""
+    http = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    return http
+
+
+def fetch_series(series_id: str, observation_start: str = DEFAULT_START,
+                 http: requests.Session | None = None, base_url: str | None = None) -> list[dict]:
     params = {
         "series_id":         series_id,
         "api_key":           FRED_API_KEY,
@@ -28,11 +62,25 @@ def fetch_series(series_id: str, observation_start: str = "2020-01-01") -> list[
         "observation_start": observation_start,
     }
 
-    response = requests.get(FRED_BASE_URL, params=params)
+    response = (http or requests).get(base_url or FRED_BASE_URL, params=params, timeout=TIMEOUT)
     response.raise_for_status()
 
     return response.json().get("observations", [])
 
+
+def get_observation_starts(session, series_ids: list[str], mode: str = MODE) -> dict:
+    """Per-series observation_start (YYYY-MM-DD): day after the stored watermark, or DEFAULT_START."""
+    if mode == "backfill":
+        return {s: DEFAULT_START for s in series_ids}
+    if mode != "incremental":
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'backfill'")
+
+    watermarks = get_latest_dates(session, EconomicIndicator, "series_id")
+    return {
+        s: (watermarks[s] + timedelta(days=1)).isoformat() if watermarks.get(s) else DEFAULT_START
+        for s in series_ids
+    }
+
 def transform(observations: list[dict], series_id: str) -> list[dict]:
     records = []
     for obs in observations:
@@ -45,29 +93,45 @@ def transform(observations: list[dict], series_id: str) -> list[dict]:
         })
     return records
 
-def run():
-    session = get_session()
-    try:
-        for series_id, name in SERIES.items():
-            print(f"[{series_id}] Fetching '{name}'...")
-            try:
-                observations = fetch_series(series_id)
-                records = transform(observations, series_id)
-
-                if not records:
-                    print(f"[{series_id}] No valid records, skipping.")
-                    continue
-
-                insert_economic_indicators(session, records)
-                print(f"[{series_id}] Inserted {len(records)} records.")
-
-            except requests.HTTPError as e:
-                print(f"[{series_id}] HTTP error: {e}")
-            except Exception as e:
-                print(f"[{series_id}] Unexpected error: {e}")
-                session.rollback()
-    finally:
-        session.close()
+def run(mode: str = MODE, base_url: str | None = None,
+        workers: int = MAX_WORKERS, rate: float | None = RATE_LIMIT) -> list[dict]:
+    http = make_http_session(workers)
+
+    with get_session() as session:
+        starts = get_observation_starts(session, list(SERIES), mode)
+        today = date.today().isoformat()
+        pending = [s for s in SERIES if starts[s] <= today]
+
+        for series_id in SERIES:
+            if series_id not in pending:
+                print(f"[{series_id}] Up to date, skipping.")
+
+        def fetch(series_id: str) -> list[dict]:
+            print(f"[{series_id}] Fetching '{SERIES[series_id]}' from {starts[series_id]}...")
+            return fetch_series(series_id, starts[series_id], http=http, base_url=base_url)
+
+        def write(series_id: str, observations: list[dict]) -> int:
+            frame, rejected, counts = validate_series(pd.DataFrame(
+                transform(observations, series_id), columns=["series_id", "date", "value"]
+            ))
+            report(series_id, counts)
+            quarantine(session, rejected, "macro", "series_id")
+
+            if frame.empty:
+                print(f"[{series_id}] No valid records, skipping.")
+                return 0
+
+            stats = write_batches(session, insert_economic_indicators, iter_records(frame), label=series_id)
+            print(f"[{series_id}] Inserted {stats['written']} records.")
+            return stats["written"]
+
+        try:
+            stats = run_concurrent(pending, fetch, write, workers=workers, rate=rate)
+        finally:
+            http.close()
+
+    print(f"Macro ingestion summary: {summarize(stats)}")
+    return stats
 
 if __name__ == '__main__':
     run()
\ No newline at end of file
@@ -2,25 +2,57 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-import time
 import yfinance as yf
+import numpy as np
 import pandas as pd
+from datetime import date, timedelta
 from database.connection import get_session
-from database.crud import insert_market_data
+from database.crud import get_latest_dates, get_recent_closes
+from database.bulk_loader import copy_market_data
+from database.batch_writer import write_batches
+from database.models import MarketData
+from ingestion.ingestion_engine import run_concurrent, summarize
+from ingestion.progress_journal import ProgressJournal
+from ingestion.data_quality import JUMP_WINDOW, validate_ohlcv, quarantine, report
 
 TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "JPM", "V", "JNJ"]
 PERIOD = "10y"
 INTERVAL = "1d"
 
-def fetch_ticker(symbol: str) -> pd.DataFrame:
-    return yf.Ticker(symbol).history(period=PERIOD, interval=INTERVAL)
+# "incremental" only requests dates after the last stored row per ticker;
+# "backfill" re-downloads the full PERIOD.
+MODE = "incremental"
 
-def transform(df: pd.DataFrame, symbol: str) -> list[dict]:
-    
-    df = df.reset_index()
+MAX_WORKERS = 8
+RATE_LIMIT  = 2.0   # yfinance requests per second
 
+def fetch_ticker(symbol: str, start: date | None = None) -> pd.DataFrame:
+    if start is None:
+        return yf.Ticker(symbol).history(period=PERIOD, interval=INTERVAL)
+    if start > date.today():
+        return pd.DataFrame()
+    return yf.Ticker(symbol).history(start=start.isoformat(), interval=INTERVAL)
+
+
+def get_start_dates(session, tickers: list[str], mode: str = MODE) -> dict:
+    """Per-ticker fetch start: the day after the stored watermark, or None for a full backfill."""
+    if mode == "backfill":
+        return {t: None for t in tickers}
+    if mode != "incremental":
+        raise ValueError(f"Unknown mode '{mode}', expected 'incremental' or 'backfill'")
+
+    watermarks = get_latest_dates(session, MarketData, "ticker")
+    return {
+        t: pd.Timestamp(watermarks[t]).date() + timedelta(days=1) if watermarks.get(t) else None
+        for t in tickers
+    }
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def transform(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Columnar transform: yfinance frame -> market_data columns, no per-row objects."""
     df = df.rename(columns={
-        "Date":   "date",
         "Open":   "open",
         "High":   "high",
         "Low":    "low",
@@ -28,49 +60,68 @@ def transform(df: pd.DataFrame, symbol: str) -> list[dict]:
         "Volume": "volume",
     })
 
-    cols = ["date", "open", "high", "low", "close", "volume"]
-    df = df[[c for c in cols if c in df.columns]].copy()
-
-    df["ticker"] = symbol
-
-    if isinstance(df["date"].dtype, pd.DatetimeTZDtype):
-        df["date"] = df["date"].dt.tz_convert(None)
-    df["date"] = pd.to_datetime(df["date"]).dt.date
-
-    df = df.dropna(subset=["date", "close"])
-
-    return df.to_dict(orient="records")
-
-def run():
-    session = get_session()
-    try:
-        for symbol in TICKERS:
-            print(f"[{symbol}] Fetching data...")
-            try:
-                raw_df = fetch_ticker(symbol)
-
-                if raw_df.empty:
-                    print(f"[{symbol}] No data returned, skipping.")
-                    continue
-
-                records = transform(raw_df, symbol)
-
-                if not records:
-                    print(f"[{symbol}] No valid records after transform, skipping.")
-                    continue
-
-                insert_market_data(session, records)
-                print(f"[{symbol}] Inserted {len(records)} records.")
-
-            except Exception as e:
-                print(f"[{symbol}] Error: {e}")
-                session.rollback()
-
-            # Be polite to the API
-            time.sleep(1)
-
-    finally:
-        session.close()
+    dates = pd.DatetimeIndex(df.index)
+    if dates.tz is not None:
+        dates = dates.tz_convert(None)
+
+    out = pd.DataFrame({"ticker": symbol, "date": dates.normalize()}, index=range(len(df)))
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            out[col] = pd.to_numeric(df[col].to_numpy(), errors="coerce").astype("float64")
+    if "volume" in df.columns:
+        volume = pd.to_numeric(df["volume"].to_numpy(), errors="coerce")
+        out["volume"] = pd.array(np.round(volume), dtype="Int64")
+
+    mask = out["date"].notna().to_numpy()
+    if "close" in out.columns:
+        mask &= out["close"].notna().to_numpy()
+    return out[mask].reset_index(drop=True)
+
+def run(fetch_fn=fetch_ticker, tickers: list[str] | None = None, mode: str = MODE,
+        workers: int = MAX_WORKERS, rate: float | None = RATE_LIMIT, resume: bool = True) -> list[dict]:
+    tickers = tickers or TICKERS
+    today = date.today()
+
+    # tickers finished by an earlier, interrupted run for the same mode/day are skipped
+    journal = ProgressJournal("prices", run_key=f"{mode}:{today}") if resume else None
+    if journal is not None:
+        tickers = journal.pending(tickers)
+
+    with get_session() as session:
+        starts = get_start_dates(session, tickers, mode)
+        prior = get_recent_closes(session, MarketData, "ticker", tickers, JUMP_WINDOW)
+
+        def fetch(symbol: str) -> pd.DataFrame:
+            return fetch_fn(symbol, start=starts[symbol])
+
+        def load(symbol: str, raw_df: pd.DataFrame) -> int:
+            if raw_df is None or raw_df.empty:
+                print(f"[{symbol}] No new data since {starts[symbol]}, skipping.")
+                return 0
+
+            frame, rejected, counts = validate_ohlcv(transform(raw_df, symbol), key_col="ticker", prior=prior)
+            report(symbol, counts)
+            quarantine(session, rejected, "prices", "ticker")
+
+            if frame.empty:
+                print(f"[{symbol}] No valid records after transform, skipping.")
+                return 0
+
+            stats = write_batches(session, copy_market_data, frame, label=symbol)
+            print(f"[{symbol}] Inserted {stats['written']} records.")
+            return stats["written"]
+
+        def write(symbol: str, raw_df: pd.DataFrame) -> int:
+            written = load(symbol, raw_df)
+            if journal is not None:
+                journal.mark_done(symbol, starts[symbol], today, rows=written)
+                print(journal.report())
+            return written
+
+        stats = run_concurrent(tickers, fetch, write, workers=workers, rate=rate)
+
+    print(f"Price ingestion summary: {summarize(stats)}")
+    return stats
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
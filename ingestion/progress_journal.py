@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from config.settings import DATA_DIR
+
+JOURNAL_DIR = DATA_DIR / "journal"
+
+
+class ProgressJournal:
+    """
+    Append-only JSON-lines journal of completed (source, symbol, date-range)
+    units. A run is identified by `run_key` (by default mode + target end
+    date), so a run that dies midway resumes from the first symbol it had
+    not finished, while tomorrow's run starts fresh. Once every symbol
+    passed to pending() is done the run is closed (its entries dropped),
+    so a later run with the same key, e.g. a same-day re-run or retry,
+    fetches everything again instead of skipping it all.
+    """
+
+    def __init__(self, source: str, run_key: str | None = None, path: Path | None = None):
+        self.source  = source
+        self.run_key = run_key or date.today().isoformat()
+        self.path    = path or JOURNAL_DIR / f"{source}.jsonl"
+        self._lock   = threading.Lock()
+        self._done   = {}
+        self._symbols = set()
+        self._total  = 0
+        self._t0     = time.monotonic()
+        self._timed  = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        kept = []
+        with self.path.open() as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue            # torn write from a crashed run
+                if entry.get("run") == self.run_key:
+                    kept.append(line if line.endswith("\n") else line + "\n")
+                    self._done[entry["symbol"]] = entry
+
+        # entries from older runs are never needed again; keep the file small
+        with self.path.open("w") as fh:
+            fh.writelines(kept)
+
+    def pending(self, symbols: list[str]) -> list[str]:
+        """Symbols not yet completed in this run, in their original order (all of them if none are left)."""
+        self._symbols = set(symbols)
+        self._total = len(symbols)
+        remaining = [s for s in symbols if s not in self._done]
+        skipped = self._total - len(remaining)
+        if not remaining:
+            with self._lock:
+                self._close()
+            self._done.clear()
+            return list(symbols)
+        if skipped:
+            print(f"[{self.source}] Resuming run {self.run_key}: "
+                  f"{skipped}/{self._total} symbol(s) already done")
+        return remaining
+
+    def mark_done(self, symbol: str, start=None, end=None, rows: int = 0, seconds: float = 0.0) -> None:
+        entry = {
+            "run":     self.run_key,
+            "source":  self.source,
+            "symbol":  symbol,
+            "start":   str(start) if start is not None else None,
+            "end":     str(end) if end is not None else None,
+            "rows":    rows,
+            "seconds": round(seconds, 3),
+            "at":      datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            with self.path.open("a") as fh:
+                fh.write(json.dumps(entry) + "\n")
+                fh.flush()
+            self._done[symbol] = entry
+            self._timed += 1
+            if self._symbols and self._symbols.issubset(self._done):
+                self._close()
+
+    def _close(self) -> None:
+        """Every symbol of the run is done: drop its entries so the key can be reused."""
+        self.path.write_text("")
+
+    def status(self) -> dict:
+        """Progress for this run; ETA extrapolates from units completed by this process."""
+        done = len(self._done)
+        total = max(self._total, done)
+        remaining = total - done
+        elapsed = time.monotonic() - self._t0
+        rate = elapsed / self._timed if self._timed else None
+        return {
+            "done":      done,
+            "total":     total,
+            "remaining": remaining,
+            "pct":       100.0 * done / total if total else 100.0,
+            "eta_s":     rate * remaining if rate is not None else None,
+        }
+
+    def report(self) -> str:
+        st = self.status()
+        eta = f"{st['eta_s']:.0f}s" if st["eta_s"] is not None else "?"
+        return f"[{self.source}] progress {st['done']}/{st['total']} ({st['pct']:.0f}%), ETA {eta}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._done.clear()
+            self.path.write_text("")
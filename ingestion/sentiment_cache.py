@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from config.settings import DATA_DIR
+
+CACHE_PATH  = DATA_DIR / "sentiment_cache.sqlite"
+MAX_ENTRIES = 100_000
+# On overflow, evict down to this fraction of MAX_ENTRIES so eviction
+# runs once per few thousand inserts rather than on every insert.
+EVICT_TO    = 0.9
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_headline(headline: str) -> str:
+    return _WHITESPACE.sub(" ", headline).strip().lower()
+
+
+def headline_key(headline: str, model_id: str) -> str:
+    payload = f"{model_id}\x00{normalize_headline(headline)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent (label, signed_score) cache keyed by sha256(model id + normalized
+    headline), stored in a local SQLite file. Least-recently-used entries are
+    evicted once the cache grows past `max_entries`.
+    """
+
+    def __init__(self, model_id: str, path: Path | str = CACHE_PATH, max_entries: int = MAX_ENTRIES):
+        self.model_id    = model_id
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+        self._lock       = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                key       TEXT PRIMARY KEY,
+                label     TEXT NOT NULL,
+                score     REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_last_used ON sentiment_cache (last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, headlines: list[str]) -> dict[str, tuple[str, float]]:
+        """Return {headline: (label, score)} for cached headlines; counts hits and misses."""
+        keys = {headline_key(h, self.model_id): h for h in headlines}
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                part = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, label, score FROM sentiment_cache "
+                    f"WHERE key IN ({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+                for key, label, score in rows:
+                    found[keys[key]] = (label, score)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE sentiment_cache SET last_used = ? WHERE key = ?",
+                    [(now, headline_key(h, self.model_id)) for h in found],
+                )
+                self._conn.commit()
+
+            self.hits   += sum(1 for h in headlines if h in found)
+            self.misses += sum(1 for h in headlines if h not in found)
+        return found
+
+    def get(self, headline: str) -> tuple[str, float] | None:
+        return self.get_many([headline]).get(headline)
+
+    def put_many(self, scored: dict[str, tuple[str, float]]) -> None:
+        if not scored:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (key, label, score, last_used) VALUES (?, ?, ?, ?)",
+                [(headline_key(h, self.model_id), label, float(score), now)
+                 for h, (label, score) in scored.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def put(self, headline: str, label: str, score: float) -> None:
+        self.put_many({headline: (label, score)})
+
+    def _evict(self) -> None:
+        size = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+        if size <= self.max_entries:
+            return
+        excess = size - int(self.max_entries * EVICT_TO)
+        self._conn.execute(
+            "DELETE FROM sentiment_cache WHERE key IN "
+            "(SELECT key FROM sentiment_cache ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += excess
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries":   size,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "hit_rate":  self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
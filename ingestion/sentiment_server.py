@@ -0,0 +1,237 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import ipaddress
+import json
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from config.logging_config import get_logger
+from config.settings import FINBERT_BACKEND, SENTIMENT_SERVER, SENTIMENT_SERVER_AUTHKEY
+
+logger = get_logger(__name__)
+
+DEFAULT_ADDRESS = ("127.0.0.1", 6010)
+MAX_BATCH       = 64      # headlines per forward pass across all callers
+MAX_WAIT_MS     = 20      # how long the batcher waits to fill a batch
+
+
+def parse_address(value: str | None) -> tuple[str, int] | str:
+    """
+    host:port on a loopback interface, or a unix socket path given as
+    "unix:/path" or "/path". Anything else is refused: the socket is meant
+    for processes in the same container only.
+    """
+    if not value:
+        return DEFAULT_ADDRESS
+    if value.startswith("unix:"):
+        return value[len("unix:"):]
+    if value.startswith("/"):
+        return value
+    host, _, port = value.rpartition(":")
+    return _require_local((host.strip("[]") or DEFAULT_ADDRESS[0], int(port)))
+
+
+def _require_local(address: tuple[str, int] | str) -> tuple[str, int] | str:
+    if isinstance(address, str):
+        return address
+    host = address[0]
+    try:
+        local = host == "localhost" or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        local = False
+    if not local:
+        raise ValueError(f"Sentiment server address must be loopback or a unix socket, got '{host}'")
+    return address
+
+
+def format_address(address: tuple[str, int] | str) -> str:
+    return address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+
+
+def _authkey() -> bytes:
+    if not SENTIMENT_SERVER_AUTHKEY:
+        raise RuntimeError("SENTIMENT_SERVER_AUTHKEY is not set; refusing to use the sentiment server")
+    return SENTIMENT_SERVER_AUTHKEY.encode()
+
+
+# Messages are JSON over the connection's byte framing; never conn.send/recv,
+# which pickle and would run whatever an authenticated peer sends.
+def _send(conn, message: dict) -> None:
+    conn.send_bytes(json.dumps(message).encode())
+
+
+def _recv(conn) -> dict:
+    message = json.loads(conn.recv_bytes())
+    if not isinstance(message, dict):
+        raise ValueError("expected a JSON object")
+    return message
+
+
+class _Request:
+    def __init__(self, texts: list[str]):
+        self.texts  = texts
+        self.result = None
+        self.error  = None
+        self.done   = threading.Event()
+
+
+class SentimentServer:
+    """
+    Loads FinBERT once (lazily, on the first request) and serves scoring
+    requests as JSON over a local (loopback or unix) authenticated socket. Requests from concurrent
+    clients are merged into micro-batches of up to MAX_BATCH headlines.
+    """
+
+    def __init__(self, address: tuple[str, int] | str = DEFAULT_ADDRESS, backend: str | None = None,
+                 max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.address     = _require_local(address)
+        self.backend     = (backend or FINBERT_BACKEND).lower()
+        self.max_batch   = max_batch
+        self.max_wait    = max_wait_ms / 1000
+        self._pipe       = None
+        self._requests   = queue.Queue()
+        self._stop       = threading.Event()
+
+    def _model(self):
+        if self._pipe is None:
+            from ingestion.finbert_backend import load_pipeline
+            t0 = time.perf_counter()
+            self._pipe = load_pipeline(self.backend)
+            logger.info(f"FinBERT loaded in {time.perf_counter() - t0:.1f}s")
+        return self._pipe
+
+    def _next_batch(self) -> list[_Request]:
+        batch = [self._requests.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                req = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(req)
+            size += len(req.texts)
+        return batch
+
+    def _batch_loop(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            texts = [t for req in batch for t in req.texts]
+            try:
+                results = self._model()(texts, batch_size=self.max_batch, truncation=True, max_length=512)
+            except Exception as e:
+                for req in batch:
+                    req.error = str(e)
+                    req.done.set()
+                continue
+
+            offset = 0
+            for req in batch:
+                req.result = [dict(r) for r in results[offset:offset + len(req.texts)]]
+                offset += len(req.texts)
+                req.done.set()
+
+    def _handle(self, conn) -> None:
+        try:
+            while True:
+                try:
+                    message = _recv(conn)
+                except EOFError:
+                    return
+                except ValueError as e:
+                    logger.warning(f"Dropping connection after malformed message: {e}")
+                    return
+                if message.get("op") == "ping":
+                    _send(conn, {"ok": True, "loaded": self._pipe is not None, "backend": self.backend})
+                    continue
+
+                req = _Request([str(t) for t in message.get("texts") or []])
+                if req.texts:
+                    self._requests.put(req)
+                    req.done.wait()
+                else:
+                    req.result = []
+                _send(conn, {"ok": req.error is None, "results": req.result, "error": req.error})
+        finally:
+            conn.close()
+
+    def serve_forever(self) -> None:
+        authkey = _authkey()
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        with Listener(self.address, authkey=authkey) as listener:
+            logger.info(f"Sentiment server listening on {format_address(self.address)}")
+            while not self._stop.is_set():
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+
+class SentimentClient:
+    """
+    Thin client with the same call signature and output as a transformers
+    text-classification pipeline, so score_sentiment / score_sentiments
+    accept it in place of a local model. `backend` is the server's
+    FinBERT backend, as reported by ping().
+    """
+
+    def __init__(self, address: tuple[str, int] | str = DEFAULT_ADDRESS):
+        self.address = _require_local(address)
+        self.backend = None
+        self._conn   = None
+        self._lock   = threading.Lock()
+
+    def _request(self, message: dict) -> dict:
+        with self._lock:
+            if self._conn is None:
+                self._conn = Client(self.address, authkey=_authkey())
+            try:
+                _send(self._conn, message)
+                return _recv(self._conn)
+            except (EOFError, OSError):
+                self._conn = None
+                raise
+
+    def ping(self) -> bool:
+        try:
+            reply = self._request({"op": "ping"})
+        except (ConnectionError, EOFError, OSError):
+            return False
+        self.backend = reply.get("backend")
+        return reply.get("ok", False)
+
+    def __call__(self, texts, **kwargs) -> list[dict]:
+        single = isinstance(texts, str)
+        reply = self._request({"op": "score", "texts": [texts] if single else list(texts)})
+        if not reply["ok"]:
+            raise RuntimeError(f"Sentiment server error: {reply['error']}")
+        return reply["results"]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def connect(address: str | None = None) -> SentimentClient | None:
+    """Client for the configured server, or None if none is configured or reachable."""
+    address = address or SENTIMENT_SERVER
+    if not address:
+        return None
+    if not SENTIMENT_SERVER_AUTHKEY:
+        logger.warning("SENTIMENT_SERVER is set but SENTIMENT_SERVER_AUTHKEY is not; scoring in-process")
+        return None
+    client = SentimentClient(parse_address(address))
+    return client if client.ping() else None
+
+
+if __name__ == "__main__":
+    SentimentServer(parse_address(SENTIMENT_SERVER)).serve_forever()
@@ -0,0 +1,291 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SYMBOLS         = ["BTC/USDT", "ETH/USDT"]
+EXCHANGE        = "binance"
+BAR_INTERVAL    = "1m"
+BAR_SECONDS     = {"1m": 60, "5m": 300, "1h": 3600}
+
+TICK_QUEUE_SIZE = 10_000     # ticks buffered between the websocket and the aggregator
+BAR_QUEUE_SIZE  = 5_000      # closed bars waiting for the DB flusher
+FLUSH_ROWS      = 500        # flush when this many bars are buffered ...
+FLUSH_SECONDS   = 5.0        # ... or this long after the first buffered bar
+
+_END = object()              # end-of-stream marker passed down the queues
+
+
+class CcxtProSource:
+    """Trade stream from a ccxt.pro exchange (`watch_trades`)."""
+
+    def __init__(self, exchange_id: str = EXCHANGE):
+        try:
+            import ccxt.pro as ccxtpro
+        except ImportError as e:
+            raise RuntimeError("Streaming from an exchange requires ccxt with ccxt.pro support") from e
+        self.exchange = getattr(ccxtpro, exchange_id)()
+
+    async def watch_trades(self, symbol: str) -> list[dict]:
+        return await self.exchange.watch_trades(symbol)
+
+    async def close(self) -> None:
+        await self.exchange.close()
+
+
+class ReplaySource:
+    """
+    Replays recorded trades with the same `watch_trades` interface, for
+    tests and offline runs. `trades` are ccxt-style dicts (symbol,
+    timestamp ms, price, amount) or a path to a JSON-lines file of them.
+    `speed` > 0 sleeps for the recorded gaps divided by speed; 0 = as fast as possible.
+    """
+
+    def __init__(self, trades, speed: float = 0.0, batch: int = 50):
+        if isinstance(trades, (str, Path)):
+            with open(trades) as fh:
+                trades = [json.loads(line) for line in fh if line.strip()]
+        self.speed = speed
+        self.batch = batch
+        self._by_symbol = {}
+        for t in sorted(trades, key=lambda t: t["timestamp"]):
+            self._by_symbol.setdefault(t["symbol"], []).append(t)
+        self._pos = {s: 0 for s in self._by_symbol}
+        self.exhausted = asyncio.Event()
+
+    async def watch_trades(self, symbol: str) -> list[dict]:
+        trades = self._by_symbol.get(symbol, [])
+        pos = self._pos.get(symbol, 0)
+        if pos >= len(trades):
+            if all(self._pos[s] >= len(self._by_symbol[s]) for s in self._by_symbol):
+                self.exhausted.set()
+            await asyncio.sleep(3600)       # a real stream just goes quiet
+            return []
+        page = trades[pos:pos + self.batch]
+        self._pos[symbol] = pos + len(page)
+        if self.speed > 0 and pos > 0:
+            await asyncio.sleep((page[-1]["timestamp"] - trades[pos - 1]["timestamp"]) / 1000 / self.speed)
+        else:
+            await asyncio.sleep(0)
+        return page
+
+    async def close(self) -> None:
+        pass
+
+
+class BarAggregator:
+    """Folds ticks into OHLCV bars; a bar is emitted when a later bucket's first tick arrives."""
+
+    def __init__(self, interval: str = BAR_INTERVAL):
+        self.interval = interval
+        self.step_ms  = BAR_SECONDS[interval] * 1000
+        self.open     = {}          # symbol -> current bar dict
+        self.late     = 0
+
+    def _new_bar(self, symbol: str, bucket: int, price: float, amount: float) -> dict:
+        return {"ticker": symbol, "interval": self.interval, "bucket": bucket,
+                "open": price, "high": price, "low": price, "close": price, "volume": amount}
+
+    def update(self, symbol: str, ts_ms: int, price: float, amount: float) -> dict | None:
+        bucket = ts_ms - ts_ms % self.step_ms
+        bar = self.open.get(symbol)
+
+        if bar is None:
+            self.open[symbol] = self._new_bar(symbol, bucket, price, amount)
+            return None
+        if bucket < bar["bucket"]:
+            self.late += 1              # the bar it belongs to is already flushed
+            return None
+        if bucket == bar["bucket"]:
+            bar["high"] = max(bar["high"], price)
+            bar["low"] = min(bar["low"], price)
+            bar["close"] = price
+            bar["volume"] += amount
+            return None
+
+        self.open[symbol] = self._new_bar(symbol, bucket, price, amount)
+        return bar
+
+    def drain(self) -> list[dict]:
+        bars, self.open = list(self.open.values()), {}
+        return bars
+
+
+def to_row(bar: dict) -> dict:
+    return {
+        "ticker":   bar["ticker"],
+        "interval": bar["interval"],
+        "ts":       datetime.fromtimestamp(bar["bucket"] / 1000, tz=timezone.utc),
+        "open":     bar["open"],
+        "high":     bar["high"],
+        "low":      bar["low"],
+        "close":    bar["close"],
+        "volume":   float(bar["volume"]),
+    }
+
+
+def write_bars_to_db(rows: list[dict]) -> int:
+    from database.connection import get_session
+    from database.bulk_loader import copy_intraday_bars
+
+    with get_session() as session:
+        return copy_intraday_bars(session, rows)
+
+
+class StreamIngester:
+    """
+    websocket trades -> bounded tick queue -> bar aggregator -> bounded bar
+    queue -> micro-batch DB flusher. Every hand-off is a bounded asyncio
+    queue, so a slow database blocks the flusher, then the aggregator, then
+    the stream readers, instead of growing memory without limit.
+    """
+
+    def __init__(self, source, symbols: list[str] = SYMBOLS, interval: str = BAR_INTERVAL,
+                 write_fn: Callable[[list[dict]], int] = write_bars_to_db,
+                 flush_rows: int = FLUSH_ROWS, flush_seconds: float = FLUSH_SECONDS,
+                 tick_queue_size: int = TICK_QUEUE_SIZE, bar_queue_size: int = BAR_QUEUE_SIZE):
+        self.source        = source
+        self.symbols       = symbols
+        self.write_fn      = write_fn
+        self.flush_rows    = flush_rows
+        self.flush_seconds = flush_seconds
+        self.aggregator    = BarAggregator(interval)
+        self.ticks         = asyncio.Queue(maxsize=tick_queue_size)
+        self.bars          = asyncio.Queue(maxsize=bar_queue_size)
+        self.stats         = {"ticks": 0, "bars": 0, "flushes": 0, "rows_written": 0, "flush_errors": 0}
+        self._stopping     = asyncio.Event()
+
+    async def _read(self, symbol: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                trades = await self.source.watch_trades(symbol)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{symbol}] stream error: {e}; reconnecting")
+                await asyncio.sleep(1)
+                continue
+            for t in trades:
+                await self.ticks.put((symbol, int(t["timestamp"]), float(t["price"]), float(t["amount"])))
+
+    async def _aggregate(self) -> None:
+        while True:
+            item = await self.ticks.get()
+            if item is _END:
+                break
+            self.stats["ticks"] += 1
+            closed = self.aggregator.update(*item)
+            if closed is not None:
+                await self.bars.put(closed)
+        for bar in self.aggregator.drain():
+            await self.bars.put(bar)
+        await self.bars.put(_END)
+
+    async def _flush(self, buffer: list[dict]) -> None:
+        rows = [to_row(b) for b in buffer]
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        try:
+            written = await loop.run_in_executor(None, self.write_fn, rows)
+            self.stats["rows_written"] += written if written is not None else len(rows)
+        except Exception as e:
+            self.stats["flush_errors"] += 1
+            logger.error(f"Flush of {len(rows)} bars failed: {e}")
+        self.stats["flushes"] += 1
+        logger.info(f"Flushed {len(rows)} bars in {time.perf_counter() - t0:.2f}s")
+
+    async def _flusher(self) -> None:
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                bar = await asyncio.wait_for(self.bars.get(), timeout)
+            except asyncio.TimeoutError:
+                bar = None              # flush deadline reached with nothing new
+            if bar is _END:
+                break
+            if bar is not None:
+                buffer.append(bar)
+                self.stats["bars"] += 1
+                deadline = deadline or time.monotonic() + self.flush_seconds
+            if buffer and (len(buffer) >= self.flush_rows or time.monotonic() >= deadline):
+                await self._flush(buffer)
+                buffer, deadline = [], None
+        if buffer:
+            await self._flush(buffer)
+
+    async def run(self, duration: float | None = None) -> dict:
+        """Stream until stop() is called or `duration` seconds elapse; open bars are flushed on exit."""
+        aggregator = asyncio.create_task(self._aggregate())
+        flusher = asyncio.create_task(self._flusher())
+        readers = [asyncio.create_task(self._read(s)) for s in self.symbols]
+
+        try:
+            if duration is None:
+                await self._stopping.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stopping.set()
+            for task in readers:
+                task.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await self.ticks.put(_END)
+            await aggregator
+            await flusher
+            await self.source.close()
+
+        self.stats["late_ticks"] = self.aggregator.late
+        return self.stats
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+async def replay(trades, write_fn: Callable[[list[dict]], int], interval: str = BAR_INTERVAL, **kwargs) -> dict:
+    """Run the full pipeline over recorded trades until they are exhausted."""
+    source = ReplaySource(trades)
+    symbols = sorted(source._by_symbol) or SYMBOLS
+    ingester = StreamIngester(source, symbols, interval, write_fn, **kwargs)
+
+    async def stop_when_done():
+        await source.exhausted.wait()
+        while not ingester.ticks.empty():
+            await asyncio.sleep(0.01)
+        ingester.stop()
+
+    watcher = asyncio.create_task(stop_when_done())
+    stats = await ingester.run()
+    watcher.cancel()
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream trades into intraday bars")
+    parser.add_argument("--exchange", default=EXCHANGE)
+    parser.add_argument("--symbols", nargs="*", default=SYMBOLS)
+    parser.add_argument("--interval", default=BAR_INTERVAL, choices=list(BAR_SECONDS))
+    parser.add_argument("--replay", help="JSON-lines file of recorded trades instead of a live stream")
+    parser.add_argument("--duration", type=float, help="stop after N seconds")
+    args = parser.parse_args()
+
+    if args.replay:
+        print(asyncio.run(replay(args.replay, write_bars_to_db, args.interval)))
+    else:
+        ingester = StreamIngester(CcxtProSource(args.exchange), args.symbols, args.interval)
+        print(asyncio.run(ingester.run(args.duration)))
@@ -9,39 +9,27 @@ from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from pyod.models.iforest import IForest
 from pyod.models.lof import LOF
 
-from sqlalchemy import text
-from database.connection import engine
 from database.crud import insert_anomaly
 from config.logging_config import get_logger
+from ingestion.feature_registry import select
+from ml.feature_store import get_features
 from database.connection import get_session
 
 logger = get_logger(__name__)
 
-FEATURES = [
+FEATURES = select(
     'log_return',
     'volume_ratio',
     'rolling_std_21',
     'rsi_14',
     'bb_pct_b',
-]
+)
 
 CONTAMINATION = 0.05  # expect ~5% anomalies
 
 
 def load_data(ticker: str) -> pd.DataFrame:
-    query = """
-             SELECT *
-            FROM features
-            WHERE ticker = :ticker
-            ORDER BY date ASC
-            """
-    with engine.connect() as conn:
-        df = pd.read_sql(
-            sql=text(query),
-            con=conn,
-            params={'ticker': ticker}
-        )
-    return df
+    return get_features(ticker, ['ticker', 'date'] + FEATURES)
 
 
 def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
@@ -2,66 +2,287 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import os
+import threading
 import time
+import uuid
+from collections import OrderedDict
 import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
 from sqlalchemy import text
 from database.connection import engine
 from config.logging_config import get_logger
+from config.settings import DATA_DIR, FEATURE_CACHE_MAX_MB, FEATURE_CACHE_TTL
 
 logger = get_logger(__name__)
 
-# Global in-memory cache
-_cache = {}
+CACHE_MAX_BYTES = int(FEATURE_CACHE_MAX_MB * 1024 * 1024)
+CACHE_TTL       = FEATURE_CACHE_TTL
+# Touched by notify_written(); entries loaded before its mtime are stale in
+# every process, not just the one that wrote the features.
+WRITE_MARKER    = DATA_DIR / "features.updated"
+# One uncompressed Arrow IPC file per ticker (features + close), read through
+# a memory map so a projection only touches the requested columns' pages.
+# A file whose mtime is older than CACHE_TTL is re-synced from the DB before
+# it is served, so writes that never reach notify_written (other hosts, other
+# DATA_DIRs) are picked up within the same bound as the in-process cache.
+STORE_DIR       = DATA_DIR / "feature_store"
+USE_DISK_STORE  = True
 
+# (ticker, columns or None) -> {"df", "bytes", "loaded_at"}; least recently used first
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "stale": 0, "uncached": 0,
+          "disk_reads": 0, "db_reads": 0}
+_bytes = 0
 
-def _query_db(ticker: str) -> pd.DataFrame:
-    query = """
-            SELECT *
-            FROM features
-            WHERE ticker = :ticker
-            ORDER BY date ASC
+
+def _query_db(ticker: str, since=None) -> pd.DataFrame:
+    query = f"""
+            SELECT f.*, m.close
+            FROM features f
+            LEFT JOIN market_data m
+                ON m.ticker = f.ticker
+                AND m.date = f.date
+            WHERE f.ticker = :ticker
+            {"AND f.date > :since" if since is not None else ""}
+            ORDER BY f.date ASC
             """
+    params = {'ticker': ticker}
+    if since is not None:
+        params['since'] = since
     with engine.connect() as conn:
         df = pd.read_sql(
             sql=text(query),
             con=conn,
-            params={'ticker': ticker}
+            params=params
         )
     return df
 
 
-def get_features(ticker: str) -> pd.DataFrame:
-    """Return features from cache or DB."""
-    if ticker not in _cache:
-        logger.info(f'No data for {ticker} trying to fetch...')
+def _store_path(ticker: str) -> Path:
+    return STORE_DIR / f"{ticker.replace('/', '_')}.arrow"
+
+
+def _read_disk(ticker: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+    path = _store_path(ticker)
+    if not path.exists():
+        return None
+    with pa.memory_map(str(path)) as source:
+        table = ipc.open_file(source).read_all()
+        if columns:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas()
+
+
+def _write_disk(ticker: str, df: pd.DataFrame) -> None:
+    """Write atomically (temp file + rename) so readers never map a half-written file."""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _store_path(ticker)
+    tmp = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def sync_disk(ticker: str) -> int:
+    """
+    Bring one ticker's disk copy up to date: append rows newer than its
+    last date (or write it in full if missing). Returns rows added. The
+    file's mtime records when it was last checked against the DB.
+    """
+    existing = _read_disk(ticker)
+    if existing is None or existing.empty:
         df = _query_db(ticker)
-        _cache[ticker] = df
-        print(f"fetched {ticker}")
-    return _cache[ticker]
+        if not df.empty:
+            _write_disk(ticker, df)
+        return len(df)
 
+    new = _query_db(ticker, since=existing["date"].max())
+    if new.empty:
+        os.utime(_store_path(ticker))
+        return 0
+    _write_disk(ticker, pd.concat([existing, new[existing.columns]], ignore_index=True))
+    return len(new)
 
 
-def invalidate(ticker: str) -> None:
-    _cache.pop(ticker, None)
+def _last_write() -> float:
+    try:
+        return WRITE_MARKER.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def _drop(key) -> None:
+    global _bytes
+    entry = _cache.pop(key, None)
+    if entry is not None:
+        _bytes -= entry["bytes"]
+
+
+def _lookup(key) -> pd.DataFrame | None:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry["loaded_at"] > CACHE_TTL:
+        _stats["expired"] += 1
+    elif entry["loaded_at"] < _last_write():
+        _stats["stale"] += 1
+    else:
+        _cache.move_to_end(key)
+        return entry["df"]
+    _drop(key)
+    return None
+
+
+def _store(key, df: pd.DataFrame, loaded_at: float) -> None:
+    global _bytes
+    size = int(df.memory_usage(deep=True).sum())
+    if size > CACHE_MAX_BYTES:
+        _stats["uncached"] += 1
+        return
+    _drop(key)
+    while _cache and _bytes + size > CACHE_MAX_BYTES:
+        _, evicted = _cache.popitem(last=False)
+        _bytes -= evicted["bytes"]
+        _stats["evictions"] += 1
+    _cache[key] = {"df": df, "bytes": size, "loaded_at": loaded_at}
+    _bytes += size
+
+
+def _disk_expired(ticker: str) -> bool:
+    path = _store_path(ticker)
+    return path.exists() and time.time() - path.stat().st_mtime > CACHE_TTL
+
+
+def _load(ticker: str, columns: list[str] | None) -> pd.DataFrame:
+    if USE_DISK_STORE:
+        try:
+            if _disk_expired(ticker):
+                sync_disk(ticker)
+            df = _read_disk(ticker, columns)
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning(f"[{ticker}] unreadable feature store file, reloading from DB: {e}")
+            df = None
+        if df is not None:
+            with _lock:
+                _stats["disk_reads"] += 1
+            return df
+
+    logger.info(f'No data for {ticker} trying to fetch...')
+    df = _query_db(ticker)
+    with _lock:
+        _stats["db_reads"] += 1
+    if USE_DISK_STORE and not df.empty:
+        _write_disk(ticker, df)
+    print(f"fetched {ticker}")
+    return df[[c for c in columns if c in df.columns]] if columns else df
+
+
+def get_features(ticker: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Features (plus close) for one ticker, oldest first, optionally only
+    `columns`. Served from the in-process cache, else the memory-mapped
+    on-disk copy (re-synced first when older than CACHE_TTL), else the DB
+    (which then seeds the disk copy).
 
+    The cache is LRU under a byte budget (CACHE_MAX_BYTES, measured with
+    memory_usage(deep=True)); entries expire after CACHE_TTL seconds or
+    when features are written (notify_written). Callers get a shallow
+    copy, so adding columns never alters the cached frame.
+    """
+    key = (ticker, tuple(columns) if columns else None)
+    with _lock:
+        df = _lookup(key)
+        if df is not None:
+            _stats["hits"] += 1
+            return df.copy(deep=False)
+        _stats["misses"] += 1
+
+    loaded_at = time.time()
+    df = _load(ticker, columns)
+    with _lock:
+        _store(key, df, loaded_at)
+    return df.copy(deep=False)
+
+
+def cache_stats() -> dict:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries":   len(_cache),
+            "bytes":     _bytes,
+            "max_bytes": CACHE_MAX_BYTES,
+            "hit_rate":  _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def invalidate(ticker: str) -> None:
+    with _lock:
+        for key in [k for k in _cache if k[0] == ticker]:
+            _drop(key)
 
 
 def invalidate_all() -> None:
-    _cache.clear()
+    global _bytes
+    with _lock:
+        _cache.clear()
+        _bytes = 0
+
+
+def notify_written(tickers=None) -> None:
+    """
+    Called from the feature write path: drop the written tickers (all if
+    None) here, refresh their disk copies incrementally and touch
+    WRITE_MARKER so other processes reload them too. A disk copy that
+    cannot be refreshed is removed, so readers fall back to the DB.
+    """
+    if tickers is None:
+        invalidate_all()
+        tickers = [p.stem for p in STORE_DIR.glob("*.arrow")] if USE_DISK_STORE else []
+    else:
+        for ticker in tickers:
+            invalidate(ticker)
+
+    if USE_DISK_STORE:
+        for ticker in tickers:
+            try:
+                sync_disk(ticker)
+            except Exception as e:
+                logger.warning(f"[{ticker}] feature store refresh failed, dropping disk copy: {e}")
+                _store_path(ticker).unlink(missing_ok=True)
+
+    WRITE_MARKER.parent.mkdir(parents=True, exist_ok=True)
+    WRITE_MARKER.touch()
+
 
 if __name__ == "__main__":
     import time
     tickers = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'GOOGL']
-    
+
     for ticker in tickers:
         start = time.time()
         df = get_features(ticker)
         elapsed = (time.time() - start) * 1000
         print(f"{ticker}: {len(df)} rows in {elapsed:.1f}ms")
-    
+
     print("\n--- Second call (from cache) ---")
     for ticker in tickers:
         start = time.time()
         df = get_features(ticker)
         elapsed = (time.time() - start) * 1000
-        print(f"{ticker}: {len(df)} rows in {elapsed:.1f}ms")
\ No newline at end of file
+        print(f"{ticker}: {len(df)} rows in {elapsed:.1f}ms")
+
+    invalidate_all()
+    print("\n--- Third call (memory-mapped disk copy, two columns) ---")
+    for ticker in tickers:
+        start = time.time()
+        df = get_features(ticker, ["date", "rsi_14"])
+        elapsed = (time.time() - start) * 1000
+        print(f"{ticker}: {len(df)} rows in {elapsed:.1f}ms")
+
+    print(cache_stats())
@@ -7,39 +7,26 @@ import numpy as np
 from prophet import Prophet
 from xgboost import XGBRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-from sqlalchemy import text
-from database.connection import engine, get_session
+from database.connection import get_session
 from database.crud import insert_forecasts
 from config.logging_config import get_logger
+from ingestion.feature_registry import select
+from ml.feature_store import get_features
 
 logger = get_logger(__name__)
 
-FEATURES = [
+FEATURES = select(
     'lag_1d', 'lag_5d', 'lag_21d', 'lag_63d',
     'rolling_mean_21', 'rolling_std_21',
     'rsi_14', 'volume_ratio', 'bb_pct_b'
-]
+)
 
 HORIZONS = [30, 90]
 
 
 def load_data(ticker: str) -> pd.DataFrame:
-    query = """
-        SELECT f.*, m.close
-        FROM features f
-        JOIN market_data m
-            ON f.ticker = m.ticker
-            AND f.date = m.date
-        WHERE f.ticker = :ticker
-        ORDER BY f.date ASC
-    """
-    with engine.connect() as conn:
-        df = pd.read_sql(
-            sql=text(query),
-            con=conn,
-            params={'ticker': ticker}
-        )
-    return df
+    df = get_features(ticker, ['ticker', 'date'] + FEATURES + ['close'])
+    return df.dropna(subset=['close']).reset_index(drop=True)
 
 
 def prepare_prophet_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -6,7 +6,6 @@ import pandas as pd
 import numpy as np
 from scipy.stats import ks_2samp
 from datetime import datetime, timedelta
-from sqlalchemy import text
 import os
 import json
 import smtplib
@@ -14,20 +13,17 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import requests
 
-from database.connection import engine, get_session
+from database.connection import get_session
 from config.logging_config import get_logger
+from ingestion.feature_registry import stored_features
+from ml.feature_store import get_features
 
 logger = get_logger(__name__)
 
 PSI_THRESHOLD = 0.2  # PSI alert threshold
 KS_THRESHOLD = 0.05  # KS test p-value threshold
 
-MONITORED_FEATURES = [
-    'log_return',
-    'lag_1d', 'lag_5d', 'lag_21d', 'lag_63d',
-    'rolling_mean_21', 'rolling_std_21', 'rolling_skew_21',
-    'rsi_14', 'bb_pct_b', 'volume_ratio'
-]
+MONITORED_FEATURES = stored_features()
 
 BASELINE_DAYS = 180
 PRODUCTION_DAYS = 30
@@ -74,53 +70,19 @@ def calculate_ks_test(baseline: pd.Series, production: pd.Series) -> tuple:
 def load_baseline_data(ticker: str, days: int = BASELINE_DAYS) -> pd.DataFrame:
     cutoff_date = datetime.utcnow() - timedelta(days=days * 3)  # Go further back to get enough data
     
-    query = """
-        SELECT date, log_return, lag_1d, lag_5d, lag_21d, lag_63d,
-               rolling_mean_21, rolling_std_21, rolling_skew_21,
-               rsi_14, bb_pct_b, volume_ratio
-        FROM features
-        WHERE ticker = :ticker AND date >= :cutoff_date
-        ORDER BY date ASC
-        LIMIT :limit
-    """
+    df = get_features(ticker, ['date'] + MONITORED_FEATURES)
+    df = df[pd.to_datetime(df['date']) >= pd.Timestamp(cutoff_date.date())]
     
-    with engine.connect() as conn:
-        df = pd.read_sql(
-            sql=text(query),
-            con=conn,
-            params={
-                'ticker': ticker,
-                'cutoff_date': cutoff_date.date(),
-                'limit': days
-            }
-        )
-    
-    return df
+    return df.head(days).reset_index(drop=True)
 
 
 def load_production_data(ticker: str, days: int = PRODUCTION_DAYS) -> pd.DataFrame:
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    query = """
-        SELECT date, log_return, lag_1d, lag_5d, lag_21d, lag_63d,
-               rolling_mean_21, rolling_std_21, rolling_skew_21,
-               rsi_14, bb_pct_b, volume_ratio
-        FROM features
-        WHERE ticker = :ticker AND date >= :cutoff_date
-        ORDER BY date ASC
-    """
-    
-    with engine.connect() as conn:
-        df = pd.read_sql(
-            sql=text(query),
-            con=conn,
-            params={
-                'ticker': ticker,
-                'cutoff_date': cutoff_date.date()
-            }
-        )
+    df = get_features(ticker, ['date'] + MONITORED_FEATURES)
+    df = df[pd.to_datetime(df['date']) >= pd.Timestamp(cutoff_date.date())]
     
-    return df
+    return df.reset_index(drop=True)
 
 
 def detect_drift(ticker: str, 
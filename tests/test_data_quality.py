@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from ingestion.data_quality import validate_ohlcv
+
+
+def _prices(closes, ticker="AAPL"):
+    return pd.DataFrame({
+        "ticker": ticker,
+        "date":   pd.date_range("2024-01-01", periods=len(closes)),
+        "close":  closes,
+    })
+
+
+def _jumps(rejected):
+    return rejected.loc[rejected["reason"].str.contains("price_jump"), "close"].tolist()
+
+
+def test_only_the_bad_print_is_quarantined():
+    clean, rejected, counts = validate_ohlcv(_prices([100.0, 100.0, 1000.0, 100.0]))
+    assert _jumps(rejected) == [1000.0]
+    assert clean["close"].tolist() == [100.0, 100.0, 100.0]
+    assert counts["price_jump"] == 1
+
+
+def test_row_after_a_rejected_row_is_kept():
+    _, rejected, _ = validate_ohlcv(_prices([100.0, np.nan, 1000.0, 100.0, 100.0]))
+    assert _jumps(rejected) == [1000.0]
+
+
+def test_single_row_batch_is_checked_against_stored_closes():
+    prior = {"AAPL": [100.0, 101.0, 99.0, 100.0, 100.0]}
+    _, rejected, _ = validate_ohlcv(_prices([1000.0]), prior=prior)
+    assert _jumps(rejected) == [1000.0]
+
+    clean, rejected, _ = validate_ohlcv(_prices([100.0]), prior={"AAPL": [100.0, 100.0, 1000.0]})
+    assert rejected.empty and len(clean) == 1
+
+
+def test_level_shift_followed_by_more_rows_is_kept():
+    prior = {"AAPL": [100.0] * 5}
+    clean, rejected, _ = validate_ohlcv(_prices([400.0] * 6), prior=prior)
+    assert rejected.empty and len(clean) == 6
+
+
+def test_keys_are_checked_independently():
+    df = pd.concat([_prices([100.0, 100.0, 1000.0, 100.0]), _prices([5.0, 5.0, 5.0, 5.0], "MSFT")])
+    _, rejected, _ = validate_ohlcv(df.sample(frac=1, random_state=0), prior={"MSFT": [50.0] * 5})
+    assert sorted(zip(rejected["ticker"], rejected["close"])) == [("AAPL", 1000.0)]
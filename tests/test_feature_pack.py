@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from database.models import FeatureValue
+from ingestion import feature_pack, indicators
+from ingestion.feature_registry import evaluate
+
+N_TICKERS, N_OBS = 25, 400
+LN2 = np.log(2.0)
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernel(request, monkeypatch):
+    if request.param == "numba" and not indicators.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(indicators, "HAS_NUMBA", request.param == "numba")
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def prices():
+    """(tickers, obs) OHLC blocks plus benchmark returns, with leading NaN padding and scattered gaps."""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (N_TICKERS, N_OBS)), axis=1))
+    open_ = close * (1 + rng.normal(0, 0.005, close.shape))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, close.shape))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, close.shape))
+    bench = rng.normal(0, 0.01, N_OBS)
+    returns = 0.8 * bench + rng.normal(0, 0.015, close.shape)
+    for i in range(N_TICKERS):
+        start = rng.integers(0, N_OBS // 4)
+        gaps = rng.choice(N_OBS, size=3, replace=False)
+        for arr in (close, open_, high, low, returns):
+            arr[i, :start] = np.nan
+            arr[i, gaps] = np.nan
+    bench[rng.choice(N_OBS, size=3, replace=False)] = np.nan
+    return {"open": open_, "high": high, "low": low, "close": close,
+            "returns": returns, "bench": np.broadcast_to(bench, close.shape).copy()}
+
+
+def _reference(open_: pd.Series, high: pd.Series, low: pd.Series, close: pd.Series,
+               returns: pd.Series, bench: pd.Series) -> dict:
+    """The same estimators written the usual pandas way, for one ticker."""
+    gk = (0.5 * np.log(high / low) ** 2 - (2 * LN2 - 1) * np.log(close / open_) ** 2).rolling(21).mean()
+    return {
+        "parkinson":  np.sqrt((np.log(high / low) ** 2).rolling(21).mean() / (4 * LN2)),
+        "gk":         np.sqrt(gk.clip(lower=0)),
+        "semivar":    (returns.clip(upper=0) ** 2).rolling(21).sum(),
+        "beta":       returns.rolling(63).cov(bench) / bench.rolling(63).var(),
+        "autocorr":   returns.rolling(21).corr(returns.shift(1)),
+    }
+
+
+def _fast(p: dict) -> dict:
+    return {
+        "parkinson":  feature_pack.parkinson_vol(p["high"], p["low"]),
+        "gk":         feature_pack.garman_klass_vol(p["open"], p["high"], p["low"], p["close"]),
+        "semivar":    feature_pack.downside_semivariance(p["returns"]),
+        "beta":       feature_pack.rolling_beta(p["returns"], p["bench"]),
+        "autocorr":   feature_pack.rolling_autocorr(p["returns"]),
+    }
+
+
+def test_block_matches_pandas_per_ticker(kernel, prices):
+    fast = _fast(prices)
+    for i in range(N_TICKERS):
+        ref = _reference(*(pd.Series(prices[k][i]) for k in ("open", "high", "low", "close", "returns", "bench")))
+        for name, values in fast.items():
+            np.testing.assert_allclose(values[i], ref[name].to_numpy(), rtol=0, atol=1e-12,
+                                       equal_nan=True, err_msg=f"{name}, ticker {i}")
+
+
+def test_one_dimensional_input_matches_block(kernel, prices):
+    block = _fast(prices)
+    single = _fast({k: v[3] for k, v in prices.items()})
+    for name in block:
+        np.testing.assert_array_equal(single[name], block[name][3], err_msg=name)
+
+
+def test_attach_benchmark_aligns_on_date():
+    df = pd.DataFrame({
+        "ticker": "BTC-USD",
+        "date":   pd.date_range("2024-01-05", periods=4).date,      # Fri..Mon: no benchmark at the weekend
+        "close":  [100.0, 101.0, 102.0, 103.0],
+    })
+    closes = {pd.Timestamp("2024-01-04").date(): 470.0, pd.Timestamp("2024-01-05").date(): 471.0,
+              pd.Timestamp("2024-01-08").date(): 474.0}
+    out = feature_pack.attach_benchmark(df, closes)
+    np.testing.assert_array_equal(out["benchmark_close"].to_numpy(), [471.0, np.nan, np.nan, 474.0])
+
+
+def test_beta_uses_benchmark_returns_on_matching_dates():
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range("2023-01-02", periods=200)
+    bench = pd.Series(400 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates)))), index=dates)
+    bench = bench.drop(dates[[50, 120]])                             # benchmark holidays
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    df = feature_pack.attach_benchmark(pd.DataFrame({"ticker": "AAPL", "date": dates.date, "close": close}),
+                                       dict(zip(bench.index.date, bench)))
+
+    beta = evaluate({"close": df["close"].to_numpy(), "benchmark_close": df["benchmark_close"].to_numpy()},
+                    ["beta_63"])["beta_63"]
+
+    r = np.log(pd.Series(close) / pd.Series(close).shift())
+    m = np.log(bench / bench.shift()).reindex(dates).reset_index(drop=True)
+    m[51] = m[121] = np.nan                                          # first return after each gap
+    expected = r.rolling(63).cov(m) / m.rolling(63).var()
+    np.testing.assert_allclose(beta, expected.to_numpy(), rtol=0, atol=1e-12, equal_nan=True)
+    assert np.isfinite(beta[-1]) and np.isnan(beta[150])
+
+
+def test_to_long_rows_match_feature_values():
+    frame = pd.DataFrame({
+        "ticker":           ["AAPL", "AAPL", "MSFT"],
+        "date":             pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-02"]).date,
+        "close":            [1.0, 2.0, 3.0],
+        "parkinson_vol_21": [np.nan, 0.01, 0.02],
+        "beta_63":          [1.1, np.nan, 0.9],
+    })
+    rows = feature_pack.to_long(frame, ["parkinson_vol_21", "beta_63"])
+
+    assert list(rows.columns) == [c.name for c in FeatureValue.__table__.columns]
+    got = sorted(rows.itertuples(index=False, name=None))
+    assert got == sorted([
+        ("AAPL", frame["date"][1], "parkinson_vol_21", 0.01),
+        ("MSFT", frame["date"][2], "parkinson_vol_21", 0.02),
+        ("AAPL", frame["date"][0], "beta_63", 1.1),
+        ("MSFT", frame["date"][2], "beta_63", 0.9),
+    ])
+
+
+def test_write_pack_passes_long_rows_to_copy_feature_values(monkeypatch):
+    from database import bulk_loader
+
+    calls = []
+    monkeypatch.setattr(bulk_loader, "copy_feature_values", lambda session, rows: calls.append(rows) or len(rows))
+    frame = pd.DataFrame({"ticker": ["AAPL"] * 2, "date": pd.to_datetime(["2024-01-02", "2024-01-03"]).date,
+                          "atr_14": [np.nan, 1.5]})
+
+    assert feature_pack.write_pack("session", frame, ["atr_14"]) == 1
+    assert calls[0].to_dict("records") == [{"ticker": "AAPL", "date": frame["date"][1],
+                                            "feature": "atr_14", "value": 1.5}]
+    assert feature_pack.write_pack("session", frame, []) == 0
+    assert feature_pack.write_pack("session", frame.iloc[:1], ["atr_14"]) == 0
+    assert len(calls) == 1
+
+
+def test_attach_benchmark_loads_benchmark_from_first_date(monkeypatch):
+    pytest.importorskip("yfinance")
+    from ingestion import price_fetcher
+
+    calls = []
+
+    def fake_fetch(symbol, start=None):
+        calls.append((symbol, start))
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], tz="America/New_York")
+        return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": [470.0, 472.0], "Volume": 1},
+                            index=index)
+
+    monkeypatch.setattr(price_fetcher, "fetch_ticker", fake_fetch)
+    df = pd.DataFrame({"ticker": "AAPL", "date": pd.to_datetime(["2024-01-03", "2024-01-02"]).date})
+    out = feature_pack.attach_benchmark(df)
+
+    assert calls == [(feature_pack.BENCHMARK_TICKER, pd.Timestamp("2024-01-02").date())]
+    np.testing.assert_array_equal(out["benchmark_close"].to_numpy(), [472.0, 470.0])
+    assert feature_pack.BENCHMARK_TICKER not in price_fetcher.TICKERS
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from ingestion.feature_engineer import compute_features
+from ingestion.feature_panel import FEATURE_COLUMNS, _synthetic_prices, compute_panel
+
+
+def test_panel_matches_per_ticker_loop():
+    df = _synthetic_prices(10, 300).sample(frac=1, random_state=0)   # compute_panel sorts itself
+    looped = pd.concat(
+        [compute_features(group.copy()) for _, group in df.groupby("ticker", sort=True)],
+        ignore_index=True,
+    )
+    panel = compute_panel(df)
+
+    assert list(panel["ticker"]) == list(looped["ticker"])
+    for col in FEATURE_COLUMNS:
+        np.testing.assert_allclose(panel[col].to_numpy(), looped[col].to_numpy(),
+                                   rtol=0, atol=1e-8, equal_nan=True, err_msg=col)
+
+
+def test_panel_does_not_mix_tickers_of_different_lengths():
+    df = _synthetic_prices(3, 200)
+    df = df[~((df["ticker"] == "BENCH0001") & (df.index % 200 < 150))]   # 50 rows for the middle ticker
+    panel = compute_panel(df)
+    alone = compute_features(df[df["ticker"] == "BENCH0002"].copy())
+
+    got = panel[panel["ticker"] == "BENCH0002"].reset_index(drop=True)
+    for col in FEATURE_COLUMNS:
+        np.testing.assert_allclose(got[col].to_numpy(), alone[col].to_numpy(),
+                                   rtol=0, atol=1e-8, equal_nan=True, err_msg=col)
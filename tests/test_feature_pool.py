@@ -0,0 +1,20 @@
+import numpy as np
+
+from ingestion.feature_panel import _synthetic_prices
+from ingestion.feature_pool import compute_parallel, ticker_bounds
+from ingestion.feature_registry import stored_features
+
+
+def test_ticker_bounds():
+    df = _synthetic_prices(3, 4)
+    assert ticker_bounds(df) == [(0, 4), (4, 8), (8, 12)]
+
+
+def test_pool_matches_in_process():
+    df = _synthetic_prices(9, 300)
+    names = stored_features()
+    expected = compute_parallel(df, names, workers=1)
+    pooled = compute_parallel(df, names, workers=2, shard_size=4)
+
+    assert list(pooled["ticker"]) == list(expected["ticker"])
+    np.testing.assert_array_equal(pooled[names].to_numpy(), expected[names].to_numpy())
@@ -0,0 +1,66 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from ingestion import finbert_backend as fb
+
+TEXTS = ["stocks rally on record profit", "bank shares fall", "rates quarter loss"]
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    """A two-layer random BERT classifier saved locally, so no download is needed."""
+    words = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + " ".join(TEXTS).split()
+    (tmp_path / "vocab.txt").write_text("\n".join(dict.fromkeys(words)))
+    torch.manual_seed(0)
+    labels = ["positive", "negative", "neutral"]
+    config = transformers.BertConfig(
+        vocab_size=len(dict.fromkeys(words)), hidden_size=64, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=128, num_labels=3,
+        id2label=dict(enumerate(labels)), label2id={l: i for i, l in enumerate(labels)},
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(tmp_path)
+    transformers.BertTokenizer(str(tmp_path / "vocab.txt")).save_pretrained(tmp_path)
+    return str(tmp_path)
+
+
+def test_quantized_reload_matches_in_process_quantization(tiny_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(fb, "QUANTIZED_DIR", tmp_path / "quantized")
+    fb.build_quantized(tiny_model)
+    loaded = fb.load_pipeline("quantized", model_id=tiny_model)
+
+    reference = fb.load_pipeline("pytorch", model_id=tiny_model)
+    model = torch.quantization.quantize_dynamic(reference.model, {torch.nn.Linear}, dtype=torch.qint8)
+    expected = transformers.pipeline("text-classification", model=model, tokenizer=reference.tokenizer)(TEXTS)
+
+    actual = loaded(TEXTS)
+    assert [r["label"] for r in actual] == [r["label"] for r in expected]
+    assert max(abs(a["score"] - e["score"]) for a, e in zip(actual, expected)) < 1e-6
+    assert not any(isinstance(m, torch.nn.Linear) for m in loaded.model.modules())
+
+
+def _finbert_cached() -> bool:
+    try:
+        transformers.AutoConfig.from_pretrained(fb.MODEL_ID, local_files_only=True)
+        return True
+    except OSError:
+        return False
+
+
+@pytest.mark.skipif(not _finbert_cached(), reason=f"{fb.MODEL_ID} not in the local Hugging Face cache")
+@pytest.mark.parametrize("backend,min_agreement,max_score_diff", [
+    ("quantized", 0.9, 0.1),
+    ("onnx",      1.0, 1e-4),
+])
+def test_backend_parity_with_full_precision(backend, min_agreement, max_score_diff):
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+    from ingestion.news_fetcher import SAMPLE_HEADLINES, score_sentiments
+
+    expected = score_sentiments(fb.load_pipeline("pytorch"), SAMPLE_HEADLINES)
+    actual = score_sentiments(fb.load_pipeline(backend), SAMPLE_HEADLINES)
+
+    agree = [(e, a) for e, a in zip(expected, actual) if e[0] == a[0]]
+    assert len(agree) / len(SAMPLE_HEADLINES) >= min_agreement
+    assert max(abs(e[1] - a[1]) for e, a in agree) <= max_score_diff
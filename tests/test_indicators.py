@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion import indicators
+
+N_TICKERS, N_OBS = 25, 400
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernel(request, monkeypatch):
+    if request.param == "numba" and not indicators.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(indicators, "HAS_NUMBA", request.param == "numba")
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def prices():
+    """(tickers, obs) blocks with leading NaN padding (different history lengths) and scattered gaps."""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (N_TICKERS, N_OBS)), axis=1))
+    high = close * (1 + rng.uniform(0, 0.02, close.shape))
+    low = close * (1 - rng.uniform(0, 0.02, close.shape))
+    for i in range(N_TICKERS):
+        start = rng.integers(0, N_OBS // 4)
+        for arr in (close, high, low):
+            arr[i, :start] = np.nan
+        gaps = rng.choice(N_OBS, size=3, replace=False)
+        close[i, gaps] = high[i, gaps] = low[i, gaps] = np.nan
+    return close, high, low
+
+
+def _reference(close: pd.Series, high: pd.Series, low: pd.Series) -> dict:
+    """The same indicators written the usual pandas way, for one ticker."""
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
+    tr = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    lowest, highest = low.rolling(14).min(), high.rolling(14).max()
+    pct_k = 100 * (close - lowest) / (highest - lowest)
+    return {
+        "ewm_10":       close.ewm(span=10, adjust=False).mean(),
+        "rsi":          100 - (100 / (1 + avg_gain / avg_loss)),
+        "atr":          tr.ewm(alpha=1/14, adjust=False).mean(),
+        "macd":         line,
+        "signal":       signal,
+        "hist":         line - signal,
+        "stoch_k":      pct_k,
+        "stoch_d":      pct_k.rolling(3).mean(),
+        "rolling_mean": close.rolling(20).mean(),
+        "rolling_min":  low.rolling(20).min(),
+        "rolling_max":  high.rolling(20).max(),
+        "max_drawdown": close.rolling(63).apply(lambda w: (w / np.maximum.accumulate(w) - 1).min(), raw=True),
+    }
+
+
+def _fast(close, high, low) -> dict:
+    m = indicators.macd(close)
+    st = indicators.stochastic(high, low, close)
+    return {
+        "ewm_10":       indicators.ewm(close, span=10),
+        "rsi":          indicators.rsi(close),
+        "atr":          indicators.atr(high, low, close),
+        "macd":         m["macd"],
+        "signal":       m["signal"],
+        "hist":         m["hist"],
+        "stoch_k":      st["k"],
+        "stoch_d":      st["d"],
+        "rolling_mean": indicators.rolling(close, 20, "mean"),
+        "rolling_min":  indicators.rolling(low, 20, "min"),
+        "rolling_max":  indicators.rolling(high, 20, "max"),
+        "max_drawdown": indicators.max_drawdown(close, 63),
+    }
+
+
+def test_block_matches_pandas_per_ticker(kernel, prices):
+    close, high, low = prices
+    fast = _fast(close, high, low)
+    for i in range(N_TICKERS):
+        ref = _reference(pd.Series(close[i]), pd.Series(high[i]), pd.Series(low[i]))
+        for name, values in fast.items():
+            np.testing.assert_allclose(values[i], ref[name].to_numpy(), rtol=0, atol=1e-9,
+                                       equal_nan=True, err_msg=f"{name}, ticker {i}")
+
+
+def test_one_dimensional_input_matches_block(kernel, prices):
+    close, high, low = prices
+    block = _fast(close, high, low)
+    single = _fast(close[3], high[3], low[3])
+    for name in block:
+        np.testing.assert_array_equal(single[name], block[name][3], err_msg=name)
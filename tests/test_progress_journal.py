@@ -0,0 +1,35 @@
+from ingestion.progress_journal import ProgressJournal
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+
+
+def test_interrupted_run_resumes(tmp_path):
+    path = tmp_path / "prices.jsonl"
+    journal = ProgressJournal("prices", run_key="incremental:2024-01-02", path=path)
+    assert journal.pending(SYMBOLS) == SYMBOLS
+    journal.mark_done("AAPL")
+
+    resumed = ProgressJournal("prices", run_key="incremental:2024-01-02", path=path)
+    assert resumed.pending(SYMBOLS) == ["MSFT", "NVDA"]
+    assert ProgressJournal("prices", run_key="incremental:2024-01-03", path=path).pending(SYMBOLS) == SYMBOLS
+
+
+def test_completed_run_is_closed(tmp_path):
+    path = tmp_path / "prices.jsonl"
+    journal = ProgressJournal("prices", run_key="incremental:2024-01-02", path=path)
+    for symbol in journal.pending(SYMBOLS):
+        journal.mark_done(symbol)
+    assert journal.status()["done"] == 3
+
+    rerun = ProgressJournal("prices", run_key="incremental:2024-01-02", path=path)
+    assert rerun.pending(SYMBOLS) == SYMBOLS
+
+
+def test_journal_of_a_finished_run_starts_over(tmp_path):
+    path = tmp_path / "prices.jsonl"
+    journal = ProgressJournal("prices", run_key="k", path=path)
+    for symbol in SYMBOLS:
+        journal.mark_done(symbol)          # no pending() call, so the run was never closed
+
+    assert ProgressJournal("prices", run_key="k", path=path).pending(SYMBOLS) == SYMBOLS
+    assert path.read_text() == ""
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion import feature_engineer as fe
+from ingestion import rolling_kernel
+from ingestion.feature_panel import FEATURE_COLUMNS, _synthetic_prices
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernel(request, monkeypatch):
+    if request.param == "numba" and not rolling_kernel.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(rolling_kernel, "HAS_NUMBA", request.param == "numba")
+    return request.param
+
+
+def _steps(df):
+    return fe.compute_volume_ratio(fe.compute_bollinger(fe.compute_rsi(fe.compute_rolling_stats(
+        fe.compute_lag_features(fe.compute_log_returns(df))))))
+
+
+def test_fused_features_match_step_pipeline(kernel):
+    for _, df in _synthetic_prices(20, 500).groupby("ticker"):
+        df = df.sample(frac=1, random_state=0)       # both paths must sort by date themselves
+        expected, fused = _steps(df.copy()), fe.compute_features(df.copy())
+        for col in FEATURE_COLUMNS:
+            np.testing.assert_allclose(fused[col].to_numpy(), expected[col].to_numpy(),
+                                       rtol=0, atol=1e-8, equal_nan=True, err_msg=col)
+
+
+def test_rolling_moments_match_pandas(kernel):
+    rng = np.random.default_rng(0)
+    x = 1e4 + rng.normal(0, 1, 300)               # large offset: exercises the centring
+    x[[5, 50, 51, 200]] = np.nan
+    x[100:130] = x[99]                            # constant run: skew 0, std 0
+    s = pd.Series(x).rolling(21)
+
+    out = rolling_kernel.rolling_moments(x, 21, skew=True)
+    np.testing.assert_allclose(out["mean"], s.mean(), rtol=0, atol=1e-8, equal_nan=True)
+    np.testing.assert_allclose(out["std"], s.std(), rtol=0, atol=1e-8, equal_nan=True)
+    np.testing.assert_allclose(out["skew"], s.skew(), rtol=0, atol=1e-6, equal_nan=True)
+
+
+def test_shift_is_along_last_axis():
+    x = np.arange(6, dtype=float).reshape(2, 3)
+    np.testing.assert_array_equal(rolling_kernel.shift(x, 1), [[np.nan, 0, 1], [np.nan, 3, 4]])
+    assert np.isnan(rolling_kernel.shift(x, 5)).all()
@@ -0,0 +1,34 @@
+import threading
+import time
+
+import pytest
+
+from ingestion import finbert_backend, sentiment_server
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiment_server, "SENTIMENT_SERVER_AUTHKEY", "test-key")
+    address = str(tmp_path / "sentiment.sock")
+    srv = sentiment_server.SentimentServer(address, backend="onnx")
+    srv._pipe = lambda texts, **kwargs: [{"label": "neutral", "score": 0.5} for _ in texts]
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    for _ in range(100):
+        if (tmp_path / "sentiment.sock").exists():
+            break
+        time.sleep(0.01)
+    return address
+
+
+def test_ping_reports_the_server_backend(server):
+    client = sentiment_server.SentimentClient(server)
+    assert client.ping()
+    assert client.backend == "onnx"
+    assert finbert_backend.cache_model_id(client.backend) == f"{finbert_backend.MODEL_ID}:onnx"
+    assert client(["Stocks rally"]) == [{"label": "neutral", "score": 0.5}]
+    client.close()
+
+
+def test_non_loopback_address_is_refused():
+    with pytest.raises(ValueError):
+        sentiment_server.parse_address("10.0.0.5:6010")